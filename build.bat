@@ -11,7 +11,7 @@ echo.
 
 REM Build the executable with admin manifest
 echo Building executable...
-pyinstaller --onefile --windowed --name "Clocker" --icon=NONE --uac-admin --add-data "clocker_config.json;." --hidden-import=tkcalendar --hidden-import=babel.numbers clocker.py
+pyinstaller --onefile --windowed --name "Clocker" --icon=NONE --uac-admin --add-data "clocker_config.json;." --hidden-import=clocker.gui --hidden-import=tkcalendar --hidden-import=babel.numbers --paths . clocker\__main__.py
 
 echo.
 echo ========================================
@@ -0,0 +1,7 @@
+"""
+Clocker - System Time & Date Faker
+A modern, elegant Windows utility for system time manipulation
+"""
+
+APP_NAME = "Clocker"
+APP_VERSION = "1.0.0"
@@ -0,0 +1,8 @@
+"""Entry point for ``python -m clocker`` and the PyInstaller build"""
+
+import sys
+
+from clocker.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
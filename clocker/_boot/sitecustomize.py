@@ -0,0 +1,23 @@
+"""
+Interpreter-start hook for fake_env(): starts the fake clock from
+CLOCKER_FAKE_TIME, then runs any sitecustomize this one shadows
+"""
+
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+def _chain():
+    here = os.path.dirname(os.path.abspath(__file__))
+    paths = [p for p in sys.path if os.path.abspath(p or os.curdir) != here]
+    spec = importlib.machinery.PathFinder.find_spec("sitecustomize", paths)
+    if spec is not None and spec.loader is not None:
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+if os.environ.get("CLOCKER_FAKE_TIME"):
+    from clocker.fakeclock import install_from_env
+    install_from_env()
+
+_chain()
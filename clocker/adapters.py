@@ -0,0 +1,162 @@
+"""
+Network adapters - registry index of the adapter class keys and the
+getmac-to-registry adapter inventory used by the MAC address operations
+"""
+
+import csv
+import io
+import re
+import threading
+import weakref
+from typing import NamedTuple, Optional
+
+from .backend import SystemBackend, NETWORK_CLASS_KEY, NETWORK_CONNECTIONS_KEY
+
+class AdapterIndex:
+    """One-pass, read-only map from NetCfgInstanceId / connection name to subkey path
+
+    The index is built once and reused; ``refresh`` re-enumerates the class
+    key and rebuilds only if the set of subkeys changed.
+    """
+
+    def __init__(self, backend: SystemBackend):
+        self.backend = backend
+        self.by_guid = {}
+        self.by_name = {}
+        self.guids = {}
+        self.builds = 0
+        self._subkeys = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the index if the adapter subkeys changed; returns True if rebuilt"""
+        with self._lock:
+            subkeys = self.backend.reg_subkeys(NETWORK_CLASS_KEY)
+            if not force and subkeys == self._subkeys:
+                return False
+
+            by_guid, by_name, guids = {}, {}, {}
+            for subkey_name in subkeys:
+                subkey_path = f"{NETWORK_CLASS_KEY}\\{subkey_name}"
+                try:
+                    values = self.backend.reg_values(subkey_path, ["DriverDesc", "NetCfgInstanceId"])
+                except OSError:
+                    continue  # e.g. the access-protected "Properties" subkey
+                desc = values.get("DriverDesc")
+                guid = values.get("NetCfgInstanceId")
+                if not desc or not guid:
+                    continue
+
+                guids[subkey_path] = guid
+                by_guid[guid.lower()] = subkey_path
+                try:
+                    connection = self.backend.reg_values(f"{NETWORK_CONNECTIONS_KEY}\\{guid}\\Connection", ["Name"])
+                except OSError:
+                    continue  # Adapter without a network connection (e.g. miniport)
+                if connection.get("Name"):
+                    by_name[connection["Name"].lower()] = subkey_path
+
+            self.by_guid, self.by_name = by_guid, by_name
+            self.guids = guids
+            self._subkeys = subkeys
+            self.builds += 1
+            return True
+
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+def get_adapter_index(backend: SystemBackend) -> AdapterIndex:
+    """The shared AdapterIndex for a backend"""
+    with _indexes_lock:
+        index = _indexes.get(backend)
+        if index is None:
+            index = _indexes[backend] = AdapterIndex(backend)
+        return index
+
+# ==================== ADAPTER INVENTORY ====================
+
+_TRANSPORT_GUID = re.compile(r"\\Device\\Tcpip_(\{[0-9A-Fa-f-]{36}\})")
+
+def normalize_mac(mac: str) -> str:
+    """Upper-case hex digits only, e.g. ``00163E12AB34``"""
+    return re.sub(r"[^0-9A-Fa-f]", "", mac).upper()
+
+def parse_transport_guid(transport: str) -> Optional[str]:
+    """Interface GUID from a getmac transport like ``\\Device\\Tcpip_{GUID}``"""
+    match = _TRANSPORT_GUID.search(transport or "")
+    return match.group(1).upper() if match else None
+
+def parse_getmac_csv(text: str) -> list:
+    """Rows of ``getmac /v /fo csv`` as dicts (name, description, mac, transport)"""
+    rows = []
+    reader = csv.reader(io.StringIO(text.strip()))
+    next(reader, None)  # Skip header
+    for parts in reader:
+        if len(parts) >= 4:
+            rows.append({"name": parts[0], "description": parts[1], "mac": parts[2], "transport": parts[3]})
+    return rows
+
+class Adapter(NamedTuple):
+    name: str
+    description: str
+    mac: str
+    guid: Optional[str]
+    subkey: Optional[str]
+    enabled: bool
+
+class AdapterInventory:
+    """Adapters from getmac joined to their registry keys by interface GUID, with O(1) lookups"""
+
+    def __init__(self, adapters: list):
+        self.adapters = list(adapters)
+        self.by_name = {a.name.lower(): a for a in self.adapters}
+        self.by_guid = {a.guid.lower(): a for a in self.adapters if a.guid}
+        self.by_mac = {normalize_mac(a.mac): a for a in self.adapters if a.mac}
+        self.by_desc = {a.description.lower(): a for a in self.adapters}
+
+    def __iter__(self):
+        return iter(self.adapters)
+
+    def __len__(self) -> int:
+        return len(self.adapters)
+
+    def find(self, key: str) -> Optional[Adapter]:
+        """Adapter by connection name, interface GUID, MAC address or driver description"""
+        lowered = key.strip().lower()
+        mac = normalize_mac(key)
+        return (
+            self.by_name.get(lowered)
+            or self.by_guid.get(lowered)
+            or (self.by_mac.get(mac) if len(mac) == 12 else None)
+            or self.by_desc.get(lowered)
+        )
+
+def build_inventory(getmac_csv: str, index: AdapterIndex) -> AdapterInventory:
+    """Join getmac rows to registry subkeys via ``\\Device\\Tcpip_{GUID}`` / NetCfgInstanceId"""
+    rows = parse_getmac_csv(getmac_csv)
+    if index.builds == 0:
+        index.refresh()
+
+    adapters = []
+    rebuilt = False  # At most one forced rebuild per inventory
+    for row in rows:
+        guid = parse_transport_guid(row["transport"])
+        if guid is not None:
+            subkey = index.by_guid.get(guid.lower())
+            if subkey is None and index.refresh():
+                subkey = index.by_guid.get(guid.lower())
+        else:
+            # Disabled / media-disconnected adapters have no transport - fall back to the connection name
+            subkey = index.by_name.get(row["name"].lower())
+            if subkey is None and not rebuilt:
+                # A renamed connection leaves the subkey set unchanged, so only a full rebuild sees it
+                rebuilt = index.refresh(force=True)
+                subkey = index.by_name.get(row["name"].lower())
+            guid = index.guids.get(subkey, "").upper() or None
+        mac = row["mac"] if re.fullmatch(r"[0-9A-Fa-f]{2}([-:][0-9A-Fa-f]{2}){5}", row["mac"]) else ""
+        # getmac prints "Disabled" / "N/A" instead of an address unless the adapter is enabled;
+        # an unplugged cable only drops the transport
+        enabled = bool(mac)
+        adapters.append(Adapter(row["name"], row["description"], mac, guid, subkey, enabled))
+    return AdapterInventory(adapters)
+
@@ -0,0 +1,582 @@
+"""
+System backends - every process spawn and registry access made by Clocker
+goes through a SystemBackend, so the operation layer can run on any host
+"""
+
+import ctypes
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .probes import ProbeCache
+from .shell import ShellError, ShellPool, route
+from .tracing import span
+
+try:
+    import winreg
+except ImportError:  # Not running on Windows
+    winreg = None
+
+# ==================== REGISTRY PATHS ====================
+
+NETWORK_CLASS_KEY = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e972-e325-11ce-bfc1-08002be10318}"
+NETWORK_CONNECTIONS_KEY = r"SYSTEM\CurrentControlSet\Control\Network\{4D36E972-E325-11CE-BFC1-08002BE10318}"
+COMPUTER_NAME_KEY = r"SYSTEM\CurrentControlSet\Control\ComputerName\ComputerName"
+ACTIVE_COMPUTER_NAME_KEY = r"SYSTEM\CurrentControlSet\Control\ComputerName\ActiveComputerName"
+CURRENT_VERSION_KEY = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion"
+TIME_ZONES_KEY = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion\Time Zones"
+
+# ==================== NATIVE CLOCK ====================
+
+class SYSTEMTIME(ctypes.Structure):
+    _fields_ = [
+        ("wYear", ctypes.c_ushort),
+        ("wMonth", ctypes.c_ushort),
+        ("wDayOfWeek", ctypes.c_ushort),
+        ("wDay", ctypes.c_ushort),
+        ("wHour", ctypes.c_ushort),
+        ("wMinute", ctypes.c_ushort),
+        ("wSecond", ctypes.c_ushort),
+        ("wMilliseconds", ctypes.c_ushort),
+    ]
+
+class NativeClock:
+    """Thin ctypes shim over kernel32 SetLocalTime; pass a stub ``kernel32`` to fake it"""
+
+    def __init__(self, kernel32=None):
+        self._kernel32 = kernel32
+
+    @property
+    def kernel32(self):
+        if self._kernel32 is None:
+            self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        return self._kernel32
+
+    def set_local_time(self, target: datetime):
+        st = SYSTEMTIME(
+            target.year, target.month, target.isoweekday() % 7, target.day,
+            target.hour, target.minute, target.second, target.microsecond // 1000
+        )
+        # SetLocalTime converts using the DST bias in effect *before* the call,
+        # so a second call is needed when the jump crosses a DST transition
+        for _ in range(2):
+            if not self.kernel32.SetLocalTime(ctypes.byref(st)):
+                error = ctypes.get_last_error() if hasattr(ctypes, "get_last_error") else 0
+                raise OSError(error, "SetLocalTime failed")
+
+# ==================== BACKEND INTERFACE ====================
+
+def _program(args: list) -> str:
+    """Normalized program name of a command line, used as the stats key"""
+    return os.path.splitext(os.path.basename(str(args[0])))[0].lower() if args else ""
+
+class SystemBackend:
+    """Interface that owns all process spawns and registry access (HKLM only)"""
+    name = "base"
+
+    def __init__(self):
+        self.spawn_count = 0
+        self.call_counts = Counter()
+        self.time_sync_disabled = False
+        self.probe_cache = ProbeCache()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, spawn: bool = False):
+        with self._stats_lock:
+            self.call_counts[key] += 1
+            if spawn:
+                self.spawn_count += 1
+
+    def stats(self) -> dict:
+        """Snapshot of the per-call counters"""
+        with self._stats_lock:
+            return {"spawns": self.spawn_count, "calls": dict(self.call_counts)}
+
+    # ----- processes -----
+
+    def run(self, args: list, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """Run a command and capture its text output"""
+        args = [str(a) for a in args]
+        program = _program(args)
+        self._count(program, spawn=True)
+        with span(program, "run", " ".join(args)) as traced_call:
+            result = self._run(args, timeout)
+            traced_call.set_exit_code(result.returncode)
+            return result
+
+    # ----- clock -----
+
+    def now(self) -> datetime:
+        """Current local wall-clock time"""
+        return datetime.now()
+
+    def set_local_time(self, target: datetime):
+        """Set the local wall clock in-process (no child process)"""
+        self._count("set_local_time")
+        with span("set_local_time", "clock", target.isoformat()):
+            self._set_local_time(target)
+
+    # ----- registry -----
+
+    def reg_subkeys(self, path: str) -> list:
+        """Names of the direct subkeys of an HKLM key"""
+        self._count("reg_enum")
+        with span("reg_enum", "registry", path):
+            return self._reg_subkeys(path)
+
+    def reg_values(self, path: str, names: list) -> dict:
+        """Read several values from one HKLM key; missing values are omitted"""
+        self._count("reg_read")
+        with span("reg_read", "registry", path):
+            return self._reg_values(path, list(names))
+
+    def reg_set(self, path: str, name: str, value: str):
+        """Write a REG_SZ value to an HKLM key"""
+        self._count("reg_write")
+        with span("reg_write", "registry", f"{path}\\{name}"):
+            self._reg_set(path, name, value)
+
+    def reg_delete(self, path: str, name: str):
+        """Delete a value from an HKLM key (FileNotFoundError if absent)"""
+        self._count("reg_delete")
+        with span("reg_delete", "registry", f"{path}\\{name}"):
+            self._reg_delete(path, name)
+
+    # ----- host information -----
+
+    def is_admin(self) -> bool:
+        raise NotImplementedError
+
+    def computer_name(self) -> str:
+        raise NotImplementedError
+
+    def resolve_host(self, hostname: str) -> str:
+        raise NotImplementedError
+
+    # ----- implementation hooks -----
+
+    def _set_local_time(self, target: datetime):
+        raise NotImplementedError
+
+    def _run(self, args: list, timeout: Optional[float]) -> subprocess.CompletedProcess:
+        raise NotImplementedError
+
+    def _reg_subkeys(self, path: str) -> list:
+        raise NotImplementedError
+
+    def _reg_values(self, path: str, names: list) -> dict:
+        raise NotImplementedError
+
+    def _reg_set(self, path: str, name: str, value: str):
+        raise NotImplementedError
+
+    def _reg_delete(self, path: str, name: str):
+        raise NotImplementedError
+
+# ==================== WINDOWS BACKEND ====================
+
+# Shell sessions kept per dialect; enough for an 8-adapter bounce batch, and
+# commands beyond that spawn directly instead of queueing behind it
+SHELL_SESSIONS = 8
+
+class WindowsBackend(SystemBackend):
+    """Real Windows host: persistent shell sessions (or subprocess) + winreg"""
+    name = "windows"
+
+    def __init__(self, clock: Optional[NativeClock] = None, shell_sessions: bool = True):
+        super().__init__()
+        self.clock = clock or NativeClock()
+        self.shells = ShellPool(SHELL_SESSIONS, subprocess.CREATE_NO_WINDOW, overflow=True) if shell_sessions else None
+
+    def _set_local_time(self, target):
+        self.clock.set_local_time(target)
+
+    def _run(self, args, timeout):
+        if self.shells is not None:
+            try:
+                return self.shells.run(*route(args), timeout=timeout)
+            except ShellError:
+                pass  # No usable session, or arguments the shell would reinterpret - spawn directly
+        return subprocess.run(
+            args,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            creationflags=subprocess.CREATE_NO_WINDOW
+        )
+
+    def _reg_subkeys(self, path):
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path, 0, winreg.KEY_READ) as key:
+            count = winreg.QueryInfoKey(key)[0]
+            return [winreg.EnumKey(key, i) for i in range(count)]
+
+    def _reg_values(self, path, names):
+        values = {}
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path, 0, winreg.KEY_READ) as key:
+            for name in names:
+                try:
+                    values[name] = winreg.QueryValueEx(key, name)[0]
+                except FileNotFoundError:
+                    pass
+        return values
+
+    def _reg_set(self, path, name, value):
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path, 0, winreg.KEY_SET_VALUE) as key:
+            winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)
+
+    def _reg_delete(self, path, name):
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path, 0, winreg.KEY_SET_VALUE) as key:
+            winreg.DeleteValue(key, name)
+
+    def is_admin(self):
+        try:
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except:
+            return False
+
+    def computer_name(self):
+        return socket.gethostname()
+
+    def resolve_host(self, hostname):
+        return socket.gethostbyname(hostname)
+
+# ==================== SIMULATED BACKEND ====================
+
+SIMULATED_TIMEZONES = [
+    ("(UTC-10:00) Hawaii", "Hawaiian Standard Time"),
+    ("(UTC-08:00) Pacific Time (US & Canada)", "Pacific Standard Time"),
+    ("(UTC-07:00) Mountain Time (US & Canada)", "Mountain Standard Time"),
+    ("(UTC-06:00) Central Time (US & Canada)", "Central Standard Time"),
+    ("(UTC-05:00) Eastern Time (US & Canada)", "Eastern Standard Time"),
+    ("(UTC-03:00) Brasilia", "E. South America Standard Time"),
+    ("(UTC) Coordinated Universal Time", "UTC"),
+    ("(UTC+00:00) Dublin, Edinburgh, Lisbon, London", "GMT Standard Time"),
+    ("(UTC+01:00) Amsterdam, Berlin, Bern, Rome, Stockholm, Vienna", "W. Europe Standard Time"),
+    ("(UTC+02:00) Athens, Bucharest", "GTB Standard Time"),
+    ("(UTC+03:00) Moscow, St. Petersburg", "Russian Standard Time"),
+    ("(UTC+03:30) Tehran", "Iran Standard Time"),
+    ("(UTC+04:00) Abu Dhabi, Muscat", "Arabian Standard Time"),
+    ("(UTC+05:30) Chennai, Kolkata, Mumbai, New Delhi", "India Standard Time"),
+    ("(UTC+08:00) Beijing, Chongqing, Hong Kong, Urumqi", "China Standard Time"),
+    ("(UTC+09:00) Osaka, Sapporo, Tokyo", "Tokyo Standard Time"),
+    ("(UTC+10:00) Canberra, Melbourne, Sydney", "AUS Eastern Standard Time"),
+    ("(UTC+12:00) Auckland, Wellington", "New Zealand Standard Time"),
+]
+
+SIMULATED_ADAPTERS = [
+    ("Ethernet", "Intel(R) Ethernet Connection I219-V", "00-1A-2B-3C-4D-5E"),
+    ("Wi-Fi", "Intel(R) Wi-Fi 6 AX201 160MHz", "00-1A-2B-3C-4D-5F"),
+    ("Ethernet 2", "VirtualBox Host-Only Ethernet Adapter", "0A-00-27-00-00-0C"),
+]
+
+class SimulatedBackend(SystemBackend):
+    """In-memory Windows host with configurable per-call latency and failure injection
+
+    ``latency`` is either a number of seconds added to every call or a dict
+    keyed by program name (``"tzutil"``, ``"netsh"``...) or registry op
+    (``"reg_read"``, ``"reg_write"``...) with an optional ``"default"`` entry.
+    ``link_delay`` is how long a re-enabled adapter stays down before getmac
+    reports it again. Clear an adapter's ``"media_connected"`` to unplug its
+    cable: getmac then lists it with its MAC but no bound transport.
+    """
+    name = "simulated"
+
+    def __init__(self, latency=0.0, failure_rate: float = 0.0, seed: Optional[int] = None,
+                 admin: bool = True, hostname: str = "SIM-HOST", timezone: str = "UTC",
+                 adapters: Optional[list] = None, link_delay: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.link_delay = link_delay
+        self.failure_rate = failure_rate
+        self.admin = admin
+        self.hostname = hostname
+        self.local_ip = "192.168.56.10"
+        self.timezones = list(SIMULATED_TIMEZONES)
+        self.timezone = timezone
+        self.clock_offset = timedelta(0)
+        self.w32time_registered = True
+        self.w32time_running = True
+        self._rng = random.Random(seed)
+        self._failures = Counter()
+        self._lock = threading.RLock()
+        self._keys = {}
+        self.adapters = {}
+
+        self._seed_registry(adapters if adapters is not None else SIMULATED_ADAPTERS)
+
+    # ----- setup -----
+
+    def _seed_registry(self, adapters: list):
+        for path in (COMPUTER_NAME_KEY, ACTIVE_COMPUTER_NAME_KEY):
+            self._key(path, create=True)["ComputerName"] = self.hostname
+        self._key(CURRENT_VERSION_KEY, create=True).update({"CurrentBuild": "22631", "UBR": 4460})
+        self._key(TIME_ZONES_KEY, create=True)["TzVersion"] = 0x7E60000
+
+        for index, (name, desc, mac) in enumerate(adapters):
+            guid = "{%08X-%04X-%04X-%04X-%012X}" % (
+                self._rng.getrandbits(32), self._rng.getrandbits(16), self._rng.getrandbits(16),
+                self._rng.getrandbits(16), self._rng.getrandbits(48)
+            )
+            subkey = f"{NETWORK_CLASS_KEY}\\{index:04d}"
+            values = self._key(subkey, create=True)
+            values["DriverDesc"] = desc
+            values["NetCfgInstanceId"] = guid
+            self._key(f"{NETWORK_CONNECTIONS_KEY}\\{guid}\\Connection", create=True)["Name"] = name
+            self.adapters[name] = {
+                "desc": desc,
+                "guid": guid,
+                "subkey": subkey,
+                "permanent_mac": mac,
+                "mac": mac,
+                "enabled": True,
+                "media_connected": True,
+                "up_at": 0.0,
+            }
+        # Windows keeps a non-adapter "Properties" subkey under the class key
+        self._key(f"{NETWORK_CLASS_KEY}\\Properties", create=True)
+
+    def _key(self, path: str, create: bool = False) -> dict:
+        lowered = path.lower()
+        with self._lock:
+            if lowered not in self._keys:
+                if not create:
+                    raise FileNotFoundError(2, "The system cannot find the file specified", path)
+                if "\\" in path:
+                    self._key(path.rsplit("\\", 1)[0], create=True)
+                self._keys[lowered] = (path, {})
+            return self._keys[lowered][1]
+
+    # ----- fault injection -----
+
+    def inject_failure(self, key: str, count: int = 1):
+        """Make the next ``count`` calls for ``key`` (program name or registry op) fail"""
+        with self._lock:
+            self._failures[key] += count
+
+    def _delay_for(self, key: str) -> float:
+        if isinstance(self.latency, dict):
+            return self.latency.get(key, self.latency.get("default", 0.0))
+        return self.latency
+
+    def _should_fail(self, key: str) -> bool:
+        with self._lock:
+            if self._failures[key] > 0:
+                self._failures[key] -= 1
+                return True
+            return self.failure_rate > 0 and self._rng.random() < self.failure_rate
+
+    def _simulate_call(self, key: str) -> bool:
+        """Sleep for the configured latency; returns True if this call should fail"""
+        delay = self._delay_for(key)
+        if delay:
+            time.sleep(delay)
+        return self._should_fail(key)
+
+    # ----- host information -----
+
+    def is_admin(self):
+        return self.admin
+
+    def computer_name(self):
+        return self.hostname
+
+    def resolve_host(self, hostname):
+        if self._simulate_call("dns"):
+            raise socket.gaierror(11001, "Simulated lookup failure")
+        return self.local_ip
+
+    def now(self) -> datetime:
+        """Current simulated local time"""
+        return datetime.now() + self.clock_offset
+
+    def _set_clock(self, target: datetime):
+        self.clock_offset = target - datetime.now()
+
+    def _set_local_time(self, target):
+        if self._simulate_call("set_local_time"):
+            raise PermissionError(1314, "A required privilege is not held by the client")
+        with self._lock:
+            self._set_clock(target)
+
+    # ----- registry -----
+
+    def _reg_subkeys(self, path):
+        if self._simulate_call("reg_enum"):
+            raise OSError(5, "Simulated registry failure", path)
+        prefix = path.lower().rstrip("\\") + "\\"
+        with self._lock:
+            self._key(path)
+            return [
+                display[len(prefix):]
+                for lowered, (display, _) in self._keys.items()
+                if lowered.startswith(prefix) and "\\" not in lowered[len(prefix):]
+            ]
+
+    def _reg_values(self, path, names):
+        if self._simulate_call("reg_read"):
+            raise OSError(5, "Simulated registry failure", path)
+        with self._lock:
+            values = self._key(path)
+            return {name: values[name] for name in names if name in values}
+
+    def _reg_set(self, path, name, value):
+        if self._simulate_call("reg_write"):
+            raise PermissionError(5, "Access is denied", path)
+        with self._lock:
+            self._key(path)[name] = value
+
+    def _reg_delete(self, path, name):
+        if self._simulate_call("reg_delete"):
+            raise PermissionError(5, "Access is denied", path)
+        with self._lock:
+            values = self._key(path)
+            if name not in values:
+                raise FileNotFoundError(2, "The system cannot find the file specified", name)
+            del values[name]
+
+    # ----- processes -----
+
+    def _run(self, args, timeout):
+        program = _program(args)
+        if self._simulate_call(program):
+            return subprocess.CompletedProcess(args, 1, "", f"Simulated failure: {program}")
+
+        handler = getattr(self, f"_cmd_{program}", None)
+        if handler is None:
+            return subprocess.CompletedProcess(
+                args, 1, "",
+                f"'{args[0]}' is not recognized as an internal or external command"
+            )
+        with self._lock:
+            code, out, err = handler([a for a in args[1:]])
+        return subprocess.CompletedProcess(args, code, out, err)
+
+    def _cmd_tzutil(self, args):
+        if args[:1] == ["/g"]:
+            return 0, self.timezone, ""
+        if args[:1] == ["/l"]:
+            return 0, "".join(f"{display}\n{tz_id}\n\n" for display, tz_id in self.timezones), ""
+        if args[:1] == ["/s"] and len(args) > 1:
+            if any(tz_id.lower() == args[1].lower() for _, tz_id in self.timezones):
+                self.timezone = next(tz_id for _, tz_id in self.timezones if tz_id.lower() == args[1].lower())
+                return 0, "", ""
+            return 1, "", f"Invalid time zone identifier '{args[1]}'"
+        return 1, "", "Invalid command line"
+
+    def _cmd_getmac(self, args):
+        lines = ['"Connection Name","Network Adapter","Physical Address","Transport Name"']
+        for name, adapter in self.adapters.items():
+            if adapter["enabled"] and time.monotonic() >= adapter["up_at"]:
+                mac = adapter["mac"]
+                transport = f"\\Device\\Tcpip_{adapter['guid']}" if adapter["media_connected"] else "Media disconnected"
+            else:
+                mac, transport = "N/A", "Disabled"
+            lines.append(f'"{name}","{adapter["desc"]}","{mac}","{transport}"')
+        return 0, "\n".join(lines) + "\n", ""
+
+    def _cmd_netsh(self, args):
+        # netsh interface set interface <name> enable|disable
+        if len(args) == 5 and [a.lower() for a in args[:3]] == ["interface", "set", "interface"]:
+            adapter = self.adapters.get(args[3])
+            if adapter is None:
+                return 1, "", "The interface name is not registered with the router."
+            if args[4].lower() == "disable":
+                adapter["enabled"] = False
+                return 0, "", ""
+            if args[4].lower() == "enable":
+                address = self._key(adapter["subkey"]).get("NetworkAddress")
+                if address and re.fullmatch(r"[0-9A-Fa-f]{12}", address):
+                    adapter["mac"] = "-".join(address[i:i + 2] for i in range(0, 12, 2)).upper()
+                else:
+                    adapter["mac"] = adapter["permanent_mac"]
+                adapter["enabled"] = True
+                adapter["up_at"] = time.monotonic() + self.link_delay
+                return 0, "", ""
+        return 1, "", "The syntax supplied for this command is not valid."
+
+    def _cmd_sc(self, args):
+        if len(args) == 2 and args[1].lower() == "w32time":
+            if args[0].lower() == "stop":
+                self.w32time_running = False
+                return 0, "", ""
+            if args[0].lower() == "start":
+                if not self.w32time_registered:
+                    return 1060, "", "The specified service does not exist as an installed service."
+                self.w32time_running = True
+                return 0, "", ""
+        return 1, "", "[SC] Invalid command"
+
+    def _cmd_w32tm(self, args):
+        option = args[0].lower() if args else ""
+        if option == "/unregister":
+            self.w32time_registered = False
+            self.w32time_running = False
+            return 0, "W32Time successfully unregistered.", ""
+        if option == "/register":
+            self.w32time_registered = True
+            return 0, "W32Time successfully registered.", ""
+        if option == "/resync":
+            if not self.w32time_running:
+                return 1, "", "The following error occurred: The service has not been started."
+            self.clock_offset = timedelta(0)
+            return 0, "Sending resync command to local computer\nThe command completed successfully.", ""
+        return 1, "", "The parameter is incorrect."
+
+    def _cmd_cmd(self, args):
+        # cmd /c date MM-DD-YYYY | cmd /c time HH:MM:SS
+        if len(args) == 3 and args[0].lower() == "/c":
+            now = self.now()
+            try:
+                if args[1].lower() == "date":
+                    month, day, year = (int(p) for p in re.split(r"[-/.]", args[2]))
+                    self._set_clock(now.replace(year=year, month=month, day=day))
+                    return 0, "", ""
+                if args[1].lower() == "time":
+                    hour, minute, second = (int(p) for p in args[2].split(":"))
+                    self._set_clock(now.replace(hour=hour, minute=minute, second=second))
+                    return 0, "", ""
+            except ValueError:
+                return 1, "", "The system cannot accept the date or time entered."
+        return 1, "", "The syntax of the command is incorrect."
+
+    def _cmd_powershell(self, args):
+        script = " ".join(args[1:]) if args[:1] == ["-Command"] else " ".join(args)
+        match = re.search(r"Set-Date -Date '([^']+)'", script)
+        if match:
+            try:
+                self._set_clock(datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S"))
+                return 0, "", ""
+            except ValueError:
+                return 1, "", "Set-Date : Cannot bind parameter 'Date'."
+        return 1, "", "The term is not recognized as the name of a cmdlet."
+
+# ==================== DEFAULT BACKEND ====================
+
+_default_backend: Optional[SystemBackend] = None
+_default_lock = threading.Lock()
+
+def get_backend() -> SystemBackend:
+    """Process-wide default backend (CLOCKER_BACKEND=windows|simulated overrides)"""
+    global _default_backend
+    with _default_lock:
+        if _default_backend is None:
+            choice = os.environ.get("CLOCKER_BACKEND", "").strip().lower()
+            if choice == "simulated" or (not choice and sys.platform != "win32"):
+                _default_backend = SimulatedBackend()
+            else:
+                _default_backend = WindowsBackend()
+        return _default_backend
+
+def set_backend(backend: Optional[SystemBackend]):
+    """Replace the process-wide default backend (None resets to auto-detect)"""
+    global _default_backend
+    with _default_lock:
+        _default_backend = backend
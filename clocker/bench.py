@@ -0,0 +1,245 @@
+"""
+Benchmarks - time the operation layer against a SimulatedBackend
+
+    python -m clocker.bench [--latency SECONDS] [--iterations N] [--json]
+    python -m clocker.bench --startup-budget MS
+    python -m clocker.bench --shell [--iterations N]
+    python -m clocker.bench --tracing [--iterations N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from . import tracing
+from .backend import SimulatedBackend
+from .shell import ShellPool
+from .sntp import LocalNTPServer
+from .stats import percentile
+from .system import (
+    set_system_datetime, restore_time_sync, get_timezone_info, get_available_timezones,
+    set_timezone, get_network_adapters, set_mac_address, reset_mac_address,
+    set_computer_name, generate_random_mac, apply_mac_batch
+)
+
+# ==================== OPERATIONS ====================
+
+OPERATIONS = {
+    "set_system_datetime": lambda b: set_system_datetime(2027, 2, 28, 23, 59, 50, b),
+    "restore_time_sync": lambda b: restore_time_sync(b, ntp_standins()),
+    "get_timezone_info": lambda b: get_timezone_info(b),
+    "get_available_timezones": lambda b: get_available_timezones(b),
+    "set_timezone": lambda b: set_timezone("Tokyo Standard Time", b),
+    "get_network_adapters": lambda b: get_network_adapters(b),
+    "set_mac_address": lambda b: set_mac_address("Ethernet", generate_random_mac(), b),
+    "reset_mac_address": lambda b: reset_mac_address("Ethernet", b),
+    "apply_mac_batch": lambda b: apply_mac_batch({"Ethernet": generate_random_mac(), "Wi-Fi": None}, b),
+    "set_computer_name": lambda b: set_computer_name("BENCH-HOST", b),
+}
+
+_standins = []
+
+def ntp_standins(count: int = 3) -> list:
+    """Addresses of local SNTP stand-ins (started on first use), so benchmarks stay off the network"""
+    if not _standins:
+        _standins.extend(LocalNTPServer() for _ in range(count))
+    return [standin.address for standin in _standins]
+
+def bench_operations(backend: SimulatedBackend, iterations: int = 20, names=None) -> dict:
+    """Run each operation ``iterations`` times and collect latency/throughput numbers"""
+    report = {}
+    for name, op in OPERATIONS.items():
+        if names and name not in names:
+            continue
+        spawns_before = backend.spawn_count
+        samples = []
+        failures = 0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            result = op(backend)
+            samples.append(time.perf_counter() - start)
+            if isinstance(result, tuple) and not result[0]:
+                failures += 1
+            elif isinstance(result, dict) and not all(ok for ok, _ in result.values()):
+                failures += 1
+        total = sum(samples)
+        report[name] = {
+            "iterations": iterations,
+            "failures": failures,
+            "spawns_per_call": (backend.spawn_count - spawns_before) / iterations,
+            "mean_ms": statistics.mean(samples) * 1000,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "max_ms": max(samples) * 1000,
+            "ops_per_sec": iterations / total if total else float("inf"),
+        }
+    return report
+
+def print_report(report: dict):
+    print(f"{'operation':<26}{'spawns':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'ops/s':>10}{'fail':>6}")
+    for name, row in report.items():
+        print(f"{name:<26}{row['spawns_per_call']:>8.1f}{row['mean_ms']:>10.2f}{row['p50_ms']:>10.2f}"
+              f"{row['p95_ms']:>10.2f}{row['max_ms']:>10.2f}{row['ops_per_sec']:>10.1f}{row['failures']:>6}")
+
+# ==================== CLI STARTUP ====================
+
+# Modules a headless command must never import
+GUI_MODULES = ("customtkinter", "tkcalendar", "tkinter", "clocker.gui")
+
+def bench_cli_startup(runs: int = 5, command=("status", "--json")) -> dict:
+    """Wall time of ``python -m clocker <command>`` in fresh interpreters, plus any GUI modules it imported"""
+    env = dict(os.environ, CLOCKER_BACKEND="simulated")
+    samples = []
+    gui_imports = set()
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "clocker", *command],
+            capture_output=True, text=True, env=env
+        )
+        samples.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"clocker {' '.join(command)} failed: {result.stderr.strip()[-500:]}")
+        for line in result.stderr.splitlines():
+            module = line.rpartition("|")[2].strip()
+            if module.split(".")[0] in GUI_MODULES or module in GUI_MODULES:
+                gui_imports.add(module)
+    return {
+        "command": " ".join(command),
+        "runs": runs,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "max_ms": max(samples) * 1000,
+        "gui_imports": sorted(gui_imports),
+    }
+
+# ==================== SHELL SESSIONS ====================
+
+SHELL_COMMANDS = (["echo", "hello"], ["date", "+%s"], ["sh", "-c", "exit 0"])
+
+def bench_shell(iterations: int = 200) -> dict:
+    """Per-command latency of spawn-per-call vs a persistent session, with /bin/sh as the shell"""
+    samples = {"spawn": [], "session": []}
+    pool = ShellPool(max_sessions=1)
+    try:
+        pool.run("sh", ["true"])  # Session start is paid once, outside the measurement
+        for i in range(iterations):
+            args = SHELL_COMMANDS[i % len(SHELL_COMMANDS)]
+            start = time.perf_counter()
+            subprocess.run(["/bin/sh", "-c", " ".join(args)], capture_output=True, text=True)
+            samples["spawn"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            pool.run("sh", args)
+            samples["session"].append(time.perf_counter() - start)
+    finally:
+        pool.close()
+    return {
+        mode: {
+            "iterations": iterations,
+            "mean_ms": statistics.mean(values) * 1000,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "max_ms": max(values) * 1000,
+        }
+        for mode, values in samples.items()
+    }
+
+# ==================== TRACING ====================
+
+def bench_tracing(iterations: int = 20000) -> dict:
+    """Per-call cost of the span hook with tracing off and on, next to a simulated backend spawn"""
+    backend = SimulatedBackend(latency=0.0, seed=0)
+    args = ["w32tm", "/register"]
+    was_enabled = tracing.is_enabled()
+
+    def timed(call) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        return (time.perf_counter() - start) / iterations
+
+    def hook():
+        with tracing.span("w32tm", "run", " ".join(args)) as span:
+            span.set_exit_code(0)
+
+    try:
+        empty = timed(lambda: None)
+        tracing.disable()
+        disabled = timed(hook) - empty
+        run = timed(lambda: backend.run(args)) - empty
+        tracing.enable()
+        enabled = timed(hook) - empty
+    finally:
+        tracing.reset()
+        (tracing.enable if was_enabled else tracing.disable)()
+    return {
+        "iterations": iterations,
+        "backend_run_us": run * 1e6,
+        "hook_disabled_us": disabled * 1e6,
+        "hook_enabled_us": enabled * 1e6,
+    }
+
+# ==================== ENTRY POINT ====================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clocker.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per backend call")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability that a backend call fails")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--only", nargs="*", help="operation names to run")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--startup-budget", type=float, metavar="MS",
+                        help="check that headless CLI startup stays under MS (p50) without GUI imports")
+    parser.add_argument("--shell", action="store_true", help="compare spawn-per-call with a persistent /bin/sh session")
+    parser.add_argument("--tracing", action="store_true", help="measure the per-call cost of tracing, off and on")
+    args = parser.parse_args(argv)
+
+    if args.tracing:
+        report = bench_tracing(args.iterations * 1000)
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return
+        print(f"simulated backend.run:  {report['backend_run_us']:.2f} us per call")
+        print(f"span hook, tracing off: {report['hook_disabled_us']:.3f} us")
+        print(f"span hook, tracing on:  {report['hook_enabled_us']:.3f} us")
+        return
+
+    if args.shell:
+        report = bench_shell(args.iterations * 10)
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return
+        print(f"{'mode':<10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for mode, row in report.items():
+            print(f"{mode:<10}{row['mean_ms']:>10.3f}{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}{row['max_ms']:>10.3f}")
+        print(f"speedup (p50): {report['spawn']['p50_ms'] / report['session']['p50_ms']:.1f}x")
+        return
+
+    if args.startup_budget is not None:
+        startup = bench_cli_startup()
+        within = startup["p50_ms"] <= args.startup_budget and not startup["gui_imports"]
+        if args.json:
+            print(json.dumps(dict(startup, budget_ms=args.startup_budget, ok=within), indent=2))
+        else:
+            print(f"clocker {startup['command']}: p50 {startup['p50_ms']:.0f} ms, max {startup['max_ms']:.0f} ms "
+                  f"(budget {args.startup_budget:g} ms)")
+            if startup["gui_imports"]:
+                print(f"GUI modules imported: {', '.join(startup['gui_imports'])}")
+            print("OK" if within else "OVER BUDGET")
+        sys.exit(0 if within else 1)
+
+    backend = SimulatedBackend(latency=args.latency, failure_rate=args.failure_rate, seed=0)
+    report = bench_operations(backend, args.iterations, args.only)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        print()
+        for name, row in backend.probe_cache.stats().items():
+            print(f"probe {name:<16} hits={row['hits']:<6} misses={row['misses']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Command-line interface - headless access to the system operations
+
+    python -m clocker                       launch the GUI
+    python -m clocker set-time 2027-02-28 23:59:50
+    python -m clocker offset --days 1
+    python -m clocker set-tz "Tokyo Standard Time"
+    python -m clocker set-mac Ethernet=random "Wi-Fi=reset"
+    python -m clocker restore-sync
+    python -m clocker status --json
+    python -m clocker daemon                start the operation daemon
+    python -m clocker trace daemon-trace    export the daemon's latency histograms
+    python -m clocker timeline scenario.json
+    python -m clocker rate 10 --duration 3600
+    python -m clocker matrix --range 2027-01-31 2027-12-31 1w -- python -m pytest -q
+
+Commands go through a running daemon when there is one (see daemon.py),
+otherwise they run in-process. Only the GUI command imports customtkinter /
+tkcalendar.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from . import APP_NAME, APP_VERSION, tracing
+from .backend import get_backend
+from .clockrate import ClockRateDriver
+from .daemon import DaemonError, DaemonServer, LocalClient, find_daemon
+from .fakeclock import parse_offset
+from .matrix import date_range, parse_when, run_matrix
+from .timeline import Timeline, load_scenario
+from .system import BOUNCE_DEADLINE, MAC_PATTERN, is_admin, run_as_admin, generate_random_mac
+
+DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+
+def parse_datetime(text: str) -> datetime:
+    """Parse ``YYYY-MM-DD [HH:MM[:SS]]`` (a ``T`` separator is accepted too)"""
+    for fmt in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date/time '{text}'. Use YYYY-MM-DD HH:MM:SS")
+
+def parse_mac_changes(pairs: list) -> dict:
+    """``ADAPTER=MAC`` pairs to an adapter -> MAC mapping (``random`` generates one, ``reset`` is None)"""
+    changes = {}
+    for pair in pairs:
+        adapter, sep, mac = pair.rpartition("=")
+        if not sep or not adapter.strip():
+            raise ValueError(f"Expected ADAPTER=MAC, got '{pair}'")
+        mac = mac.strip()
+        if mac.lower() == "random":
+            mac = generate_random_mac()
+        elif mac.lower() == "reset":
+            mac = None
+        elif not MAC_PATTERN.match(mac):
+            raise ValueError(f"Invalid MAC format '{mac}'. Use XX-XX-XX-XX-XX-XX")
+        changes[adapter.strip()] = mac
+    return changes
+
+# ==================== COMMANDS ====================
+
+def require_admin(client) -> bool:
+    if client.call("ping")["admin"]:
+        return True
+    print("Administrator privileges required!", file=sys.stderr)
+    return False
+
+def report(result: dict) -> int:
+    """Print an operation's result; returns the exit code"""
+    print(result["message"], file=sys.stdout if result["ok"] else sys.stderr)
+    return 0 if result["ok"] else 1
+
+def cmd_set_time(args, client) -> int:
+    target = parse_datetime(" ".join(args.datetime))
+    requested_at = time.monotonic()
+    if not require_admin(client):
+        return 1
+    # Count the time spent since the command started, as the daemon counts from receipt
+    target += timedelta(seconds=time.monotonic() - requested_at)
+    return report(client.call("set_time", at=target.isoformat(), tolerance_ms=args.tolerance))
+
+def cmd_offset(args, client) -> int:
+    if not require_admin(client):
+        return 1
+    return report(client.call(
+        "offset", weeks=args.weeks, days=args.days, hours=args.hours, minutes=args.minutes, seconds=args.seconds
+    ))
+
+def cmd_set_tz(args, client) -> int:
+    if not require_admin(client):
+        return 1
+    return report(client.call("set_tz", timezone=args.timezone))
+
+def cmd_set_mac(args, client) -> int:
+    changes = parse_mac_changes(args.changes)
+    if not require_admin(client):
+        return 1
+    result = client.call("set_mac", changes=changes, deadline=args.deadline)
+    return max(report(outcome) for outcome in result["results"].values())
+
+def cmd_set_name(args, client) -> int:
+    if not require_admin(client):
+        return 1
+    return report(client.call("set_name", name=args.name))
+
+def cmd_restore_sync(args, client) -> int:
+    if not require_admin(client):
+        return 1
+    return report(client.call("restore_sync", servers=args.server))
+
+def cmd_status(args, client) -> int:
+    status = client.call("status")
+    if args.json:
+        print(json.dumps(status, indent=2))
+        return 0
+    for key, value in status.items():
+        if key != "adapters":
+            print(f"{key:<14}{value}")
+    for adapter in status["adapters"]:
+        state = "up" if adapter["enabled"] else "down"
+        print(f"{'adapter':<14}{adapter['name']} [{adapter['mac'] or 'N/A'}] {state} - {adapter['description']}")
+    return 0
+
+def cmd_trace(args, client) -> int:
+    trace = client.call("trace", spans=args.spans)
+    if not trace["enabled"]:
+        print("Warning: tracing is off there; start it with --trace or CLOCKER_TRACE", file=sys.stderr)
+    with open(f"{args.prefix}.json", 'w', encoding='utf-8') as f:
+        json.dump(trace["json"], f, indent=2)
+    with open(f"{args.prefix}.prom", 'w', encoding='utf-8') as f:
+        f.write(trace["prometheus"])
+    for key, row in trace["json"]["operations"].items():
+        print(f"{key:<32}{row['count']:>7}  p50 {row['p50_ms']:8.2f}  p95 {row['p95_ms']:8.2f}  "
+              f"p99 {row['p99_ms']:8.2f} ms  errors {row['errors']}")
+    return 0
+
+def cmd_daemon(args) -> int:
+    backend = get_backend()
+    if not is_admin(backend):
+        run_as_admin()  # Relaunches elevated and exits on Windows
+        print("Warning: daemon running without administrator privileges.", file=sys.stderr)
+    server = DaemonServer(backend, args.address)
+    try:
+        address = server.start()
+    except (DaemonError, OSError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    print(f"{APP_NAME} daemon listening on {address} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+    return 0
+
+def cmd_stop_daemon(args) -> int:
+    client = find_daemon()
+    if client is None:
+        print("No daemon is running", file=sys.stderr)
+        return 1
+    return report(client.call("shutdown"))
+
+def cmd_matrix(args) -> int:
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    dates = [parse_when(d) for d in args.dates or []]
+    if args.range:
+        start, end, step = args.range
+        dates += date_range(parse_when(start), parse_when(end), parse_offset(step))
+
+    def progress(result):
+        status = "ok" if result["ok"] else f"FAIL ({result['returncode']})"
+        print(f"{result['at']:<22}{status:<12}{result['duration_s']:>8.2f} s", flush=True)
+
+    report = run_matrix(command, dates, workers=args.workers, tick=not args.frozen,
+                        timeout=args.timeout, on_result=None if args.json else progress)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['passed']} passed, {report['failed']} failed across {len(dates)} dates "
+              f"in {report['wall_s']:.2f} s ({report['workers']} workers, {report['speedup']:.1f}x vs serial)")
+    return 0 if report["failed"] == 0 else 1
+
+def cmd_timeline(args) -> int:
+    steps = load_scenario(args.scenario)
+    backend = get_backend()
+    if not is_admin(backend):
+        print("Administrator privileges required!", file=sys.stderr)
+        return 1
+
+    def progress(result):
+        status = "ok" if result.ok else "FAIL"
+        print(f"{result.scheduled:>8.2f} s  {result.kind:<9}{result.value:<28}{status:<6}"
+              f"jitter {result.jitter * 1000:+7.1f} ms  {result.message}", flush=True)
+
+    timeline = Timeline(steps, backend)
+    try:
+        report = timeline.run(on_step=None if args.json else progress)
+    except KeyboardInterrupt:
+        report = timeline.report()
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        jitter = report["jitter_ms"]
+        print(f"{report['completed']}/{report['steps']} steps, {report['failed']} failed - |jitter| "
+              f"p50 {jitter['p50']:.1f} ms, p95 {jitter['p95']:.1f} ms, max {jitter['max']:.1f} ms")
+    return 0 if report["failed"] == 0 and report["completed"] == report["steps"] else 1
+
+def cmd_rate(args) -> int:
+    backend = get_backend()
+    if not is_admin(backend):
+        print("Administrator privileges required!", file=sys.stderr)
+        return 1
+    driver = ClockRateDriver(args.rate, args.interval, args.max_step,
+                             parse_datetime(args.start) if args.start else None, backend)
+    driver.start()
+    print(f"Clock running at {args.rate:g}x (Ctrl+C to stop and restore real time)", flush=True)
+    deadline = time.monotonic() + args.duration if args.duration else None
+    try:
+        while True:
+            wait = args.report_every if deadline is None else min(args.report_every, deadline - time.monotonic())
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            t = driver.telemetry()
+            print(f"{backend.now():%Y-%m-%d %H:%M:%S}  steps {t['steps']}  error mean {t['mean_error_ms']:.1f} ms "
+                  f"max {t['max_error_ms']:.1f} ms  lag {t['lag_s']:.1f} s  cpu {t['cpu_percent']:.2f}%  "
+                  f"failures {t['failures']}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopped = driver.stop()
+    telemetry = driver.telemetry()
+    if args.json:
+        print(json.dumps(telemetry, indent=2))
+    elif stopped:
+        print("Stopped - clock back on real time")
+    else:
+        print("Stopping - real time is restored after the last step", file=sys.stderr)
+    return 0 if telemetry["failures"] == 0 else 1
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="clocker", description=f"{APP_NAME} {APP_VERSION} - system time & date faker")
+    parser.add_argument("--version", action="version", version=f"{APP_NAME} {APP_VERSION}")
+    parser.add_argument("--local", action="store_true", help="run in this process even if a daemon is running")
+    parser.add_argument("--trace", metavar="PREFIX",
+                        help="trace spawns, registry calls and operations; write PREFIX.json and PREFIX.prom at exit")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    commands.add_parser("gui", help="launch the graphical interface (default)")
+
+    sub = commands.add_parser("set-time", help="set the system date and time")
+    sub.add_argument("datetime", nargs="+", help="YYYY-MM-DD [HH:MM[:SS]]")
+    sub.add_argument("--tolerance", type=float, metavar="MS",
+                     help="re-apply until the read-back clock is within MS milliseconds")
+    sub.set_defaults(handler=cmd_set_time)
+
+    sub = commands.add_parser("offset", help="move the clock relative to now")
+    for unit in ("weeks", "days", "hours", "minutes", "seconds"):
+        sub.add_argument(f"--{unit}", type=float, default=0, help=f"{unit} to add (negative to go back)")
+    sub.set_defaults(handler=cmd_offset)
+
+    sub = commands.add_parser("set-tz", help="set the timezone by id, city or UTC offset")
+    sub.add_argument("timezone")
+    sub.set_defaults(handler=cmd_set_tz)
+
+    sub = commands.add_parser("set-mac", help="set or reset MAC addresses")
+    sub.add_argument("changes", nargs="+", metavar="ADAPTER=MAC", help="MAC may also be 'random' or 'reset'")
+    sub.add_argument("--deadline", type=float, default=BOUNCE_DEADLINE, help="seconds to wait for adapters to come back")
+    sub.set_defaults(handler=cmd_set_mac)
+
+    sub = commands.add_parser("set-name", help="change the computer name (takes effect after restart)")
+    sub.add_argument("name")
+    sub.set_defaults(handler=cmd_set_name)
+
+    sub = commands.add_parser("restore-sync", help="correct the clock over SNTP and re-enable Windows time sync")
+    sub.add_argument("--server", action="append", metavar="HOST[:PORT]",
+                     help="SNTP server to query (repeatable; default: configured servers)")
+    sub.set_defaults(handler=cmd_restore_sync)
+
+    sub = commands.add_parser("status", help="show time, timezone, hostname and adapters")
+    sub.add_argument("--json", action="store_true", help="print as JSON")
+    sub.set_defaults(handler=cmd_status)
+
+    sub = commands.add_parser("trace", help="export latency histograms (from the daemon, if running)")
+    sub.add_argument("prefix", help="write PREFIX.json and PREFIX.prom")
+    sub.add_argument("--spans", action="store_true", help="include the recent individual spans in the JSON")
+    sub.set_defaults(handler=cmd_trace)
+
+    sub = commands.add_parser("matrix", help="run a Python command at many fake dates in parallel")
+    sub.add_argument("--dates", nargs="+", metavar="DATETIME", help="ISO dates/datetimes to run at")
+    sub.add_argument("--range", nargs=3, metavar=("START", "END", "STEP"), help="e.g. 2027-01-01 2027-12-31 1w")
+    sub.add_argument("--workers", type=int, help="parallel instances (default: CPU count)")
+    sub.add_argument("--frozen", action="store_true", help="freeze each clock instead of letting it tick")
+    sub.add_argument("--timeout", type=float, help="seconds before an instance is killed")
+    sub.add_argument("--report", metavar="FILE", help="write the JSON report to FILE")
+    sub.add_argument("--json", action="store_true", help="print the JSON report instead of a summary")
+    sub.add_argument("command", nargs=argparse.REMAINDER, help="-- followed by the command; {at} is replaced by the date")
+    sub.set_defaults(runner=cmd_matrix)
+
+    sub = commands.add_parser("timeline", help="run a scripted sequence of clock changes on schedule")
+    sub.add_argument("scenario", help="JSON file with the steps (see timeline.py)")
+    sub.add_argument("--report", metavar="FILE", help="write the JSON report to FILE")
+    sub.add_argument("--json", action="store_true", help="print the JSON report instead of progress lines")
+    sub.set_defaults(runner=cmd_timeline)
+
+    sub = commands.add_parser("rate", help="run the system clock faster or slower than real time")
+    sub.add_argument("rate", type=float, help="virtual seconds per real second, e.g. 10 or 0.5")
+    sub.add_argument("--interval", type=float, default=1.0, help="seconds between clock steps")
+    sub.add_argument("--max-step", type=float, help="largest single step in seconds")
+    sub.add_argument("--start", help="start the virtual timeline at this date/time instead of now")
+    sub.add_argument("--duration", type=float, help="stop after this many real seconds")
+    sub.add_argument("--report-every", type=float, default=10.0, help="seconds between telemetry lines")
+    sub.add_argument("--json", action="store_true", help="print the final telemetry as JSON")
+    sub.set_defaults(runner=cmd_rate)
+
+    sub = commands.add_parser("daemon", help="serve operations over a local socket until stopped")
+    sub.add_argument("--address", help="unix:<path> or tcp:127.0.0.1:<port> (default: per-user socket)")
+    sub.set_defaults(runner=cmd_daemon)
+
+    sub = commands.add_parser("stop-daemon", help="stop the running daemon")
+    sub.set_defaults(runner=cmd_stop_daemon)
+    return parser
+
+# ==================== ENTRY POINT ====================
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        tracing.trace_to(args.trace)
+    else:
+        tracing.install_from_env()
+    if getattr(args, "runner", None):
+        try:
+            return args.runner(args)
+        except ValueError as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            return 2
+    handler = getattr(args, "handler", None)
+    if handler is None:
+        # Deferred so headless commands never pay for the GUI toolkit imports
+        from .gui import main as gui_main
+        gui_main()
+        return 0
+
+    client = None if args.local else find_daemon()
+    try:
+        return handler(args, client or LocalClient())
+    except ValueError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+    except (DaemonError, OSError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        if client is not None:
+            client.close()
@@ -0,0 +1,200 @@
+"""
+Clock rate - run the system clock faster or slower than real time by
+re-stepping it along a virtual timeline anchored to ``time.monotonic``
+
+    driver = ClockRateDriver(rate=10.0, interval=1.0)
+    driver.start()          # 1 real second now moves the clock by 10
+    ...
+    driver.stop()           # puts the clock back on real time
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .backend import SystemBackend, get_backend
+from .system import disable_time_sync, set_system_datetime
+
+# Weight of the newest sample in the apply latency estimate
+LATENCY_SMOOTHING = 0.3
+
+class ClockRateDriver:
+    """Background thread stepping the clock to ``start + elapsed * rate`` every ``interval`` seconds
+
+    ``max_step`` (seconds) caps a single step; when the clock cannot keep up,
+    the shortfall shows as ``lag_s`` in the telemetry. Between steps the
+    system clock runs at real speed, so a smaller interval means a smoother
+    virtual clock at the cost of more writes.
+    """
+
+    def __init__(self, rate: float, interval: float = 1.0, max_step: Optional[float] = None,
+                 start: Optional[datetime] = None, backend: Optional[SystemBackend] = None,
+                 restore_on_stop: bool = True):
+        if rate < 0:
+            raise ValueError("Clock rate cannot be negative")
+        if interval <= 0:
+            raise ValueError("Step interval must be positive")
+        self.rate = rate
+        self.interval = interval
+        self.max_step = max_step
+        self.start_at = start
+        self.backend = backend or get_backend()
+        self.restore_on_stop = restore_on_stop
+
+        self.steps = 0
+        self.failures = 0
+        self.last_error = ""
+        self._measured = 0
+        self._error_sum = 0.0
+        self._error_max = 0.0
+        self._step_max = 0.0
+        self._lag = 0.0
+        self._latency = 0.0
+        self._cpu = 0.0
+        self._anchor_mono = 0.0
+        self._anchor_virtual = None
+        self._anchor_real = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def virtual_now(self, mono: Optional[float] = None) -> datetime:
+        """Where the virtual timeline is at monotonic instant ``mono`` (default: now)"""
+        elapsed = (time.monotonic() if mono is None else mono) - self._anchor_mono
+        return self._anchor_virtual + timedelta(seconds=elapsed * self.rate)
+
+    def real_now(self) -> datetime:
+        """The clock as it would read had the driver never run"""
+        return self._anchor_real + timedelta(seconds=time.monotonic() - self._anchor_mono)
+
+    def start(self):
+        if self.running:
+            if not self._stopping.is_set():
+                return
+            self._thread.join()  # A stop still finishing; let it restore the clock first
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="clocker-clock-rate", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """Stop stepping and (by default) put the clock back on real time
+
+        The stepping thread restores the clock on its way out, so the restore
+        cannot be overwritten by a step still in flight. Returns False if the
+        thread has not finished within ``timeout``; it restores once it does.
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        self._stopping.set()
+        thread.join(timeout)
+        if thread.is_alive():
+            return False
+        self._thread = None
+        return True
+
+    def _set(self, target: datetime) -> tuple[bool, str]:
+        return set_system_datetime(
+            target.year, target.month, target.day, target.hour, target.minute,
+            target.second + target.microsecond / 1e6, self.backend, disable_sync=False
+        )
+
+    def _loop(self):
+        cpu_start = time.thread_time()
+        # Stopping time sync is one-off setup: done before anchoring, so it neither
+        # shifts the timeline nor seeds the latency estimate
+        disabled, message = disable_time_sync(self.backend)
+        if not disabled:
+            with self._lock:
+                self.failures += 1
+                self.last_error = message
+            return
+        with self._lock:
+            self._anchor_mono = time.monotonic()
+            self._anchor_real = self.backend.now()
+            self._anchor_virtual = self.start_at or self._anchor_real
+        next_step = self._anchor_mono
+        while not self._stopping.is_set():
+            self._step()
+            with self._lock:
+                self._cpu = time.thread_time() - cpu_start
+            # Fixed-rate schedule on the monotonic clock; skip missed slots instead of bursting
+            next_step += self.interval
+            now = time.monotonic()
+            if next_step < now:
+                next_step = now + self.interval
+            self._stopping.wait(next_step - now)
+        if self.restore_on_stop:
+            self._restore()
+
+    def _restore(self):
+        success, message = self._set(self.real_now() + timedelta(seconds=self._latency))
+        if not success:
+            with self._lock:
+                self.failures += 1
+                self.last_error = message
+
+    def _step(self):
+        try:
+            # The write lands ~latency from now, so aim at where the timeline will be then
+            launched = time.monotonic()
+            current = self.backend.now()
+            target = self.virtual_now(launched + self._latency)
+            step = (target - current).total_seconds()
+            capped = self.max_step is not None and abs(step) > self.max_step
+            if capped:
+                step = self.max_step if step > 0 else -self.max_step
+                target = current + timedelta(seconds=step)
+
+            success, message = self._set(target)
+            latency = time.monotonic() - launched
+            if not success:
+                with self._lock:
+                    self.failures += 1
+                    self.last_error = message
+                return
+
+            # Read back against the timeline to measure how well the step landed
+            offset = (self.backend.now() - self.virtual_now()).total_seconds()
+            with self._lock:
+                self.steps += 1
+                self._latency = latency if self.steps == 1 else (
+                    self._latency + LATENCY_SMOOTHING * (latency - self._latency))
+                self._step_max = max(self._step_max, abs(step))
+                if capped:
+                    # Behind the timeline by design - that is lag, not step error
+                    self._lag = -offset
+                else:
+                    self._lag = 0.0
+                    self._error_sum += abs(offset)
+                    self._error_max = max(self._error_max, abs(offset))
+                    self._measured += 1
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+                self.last_error = f"Error: {str(e)}"
+
+    def telemetry(self) -> dict:
+        """Live counters: steps, step error (ms), largest step, lag and CPU cost"""
+        with self._lock:
+            elapsed = time.monotonic() - self._anchor_mono if self._anchor_virtual else 0.0
+            return {
+                "running": self.running,
+                "rate": self.rate,
+                "interval_s": self.interval,
+                "steps": self.steps,
+                "failures": self.failures,
+                "mean_error_ms": self._error_sum / self._measured * 1000 if self._measured else 0.0,
+                "max_error_ms": self._error_max * 1000,
+                "max_step_s": self._step_max,
+                "lag_s": self._lag,
+                "apply_latency_ms": self._latency * 1000,
+                "cpu_s": self._cpu,
+                "cpu_percent": self._cpu / elapsed * 100 if elapsed else 0.0,
+                "last_error": self.last_error,
+            }
@@ -0,0 +1,468 @@
+"""
+Daemon - a long-lived (elevated) process serving operations over a local
+socket, so scripted callers pay one round-trip per change instead of a UAC
+prompt and interpreter startup
+
+The protocol is newline-delimited JSON-RPC 2.0 over a Unix socket (or a
+localhost TCP socket where AF_UNIX is unavailable). The daemon records its
+address and an access token in DAEMON_FILE; clients read it to connect.
+
+    python -m clocker daemon
+    python -m clocker set-time 2027-02-28 23:59:50     # uses the daemon if running
+"""
+
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from . import APP_NAME, APP_VERSION, tracing
+from .backend import SystemBackend, get_backend
+from .timezones import TimezoneIndex
+from .system import (
+    DATA_DIR, BOUNCE_DEADLINE, is_admin, set_system_datetime, apply_system_datetime, restore_time_sync,
+    set_computer_name, get_computer_name, get_local_ip, get_timezone_info, get_timezone_catalog, set_timezone,
+    get_adapter_inventory, apply_mac_batch
+)
+
+DAEMON_FILE = os.path.join(DATA_DIR, "clocker_daemon.json")
+CONNECT_TIMEOUT = 0.5
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+OPERATION_ERROR = -32000
+UNAUTHORIZED = -32001
+
+class DaemonError(Exception):
+    """An error response from the daemon (or a failure to reach it)"""
+
+    def __init__(self, message: str, code: int = OPERATION_ERROR):
+        super().__init__(message)
+        self.code = code
+
+def default_address() -> str:
+    """``unix:<path>`` in the temp directory, or an ephemeral localhost TCP port on Windows"""
+    if hasattr(socket, "AF_UNIX") and sys.platform != "win32":
+        user = os.environ.get("USER") or os.environ.get("USERNAME") or "user"
+        return f"unix:{os.path.join(tempfile.gettempdir(), f'clocker-{user}.sock')}"
+    return "tcp:127.0.0.1:0"
+
+def parse_address(address: str) -> tuple:
+    """(family, sockaddr) for ``unix:<path>`` or ``tcp:<host>:<port>``"""
+    scheme, _, rest = address.partition(":")
+    if scheme == "unix":
+        return socket.AF_UNIX, rest
+    if scheme == "tcp":
+        host, _, port = rest.rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    raise ValueError(f"Invalid daemon address '{address}'. Use unix:<path> or tcp:<host>:<port>")
+
+# ==================== METHODS ====================
+
+def operation_result(result: tuple[bool, str]) -> dict:
+    success, message = result
+    return {"ok": success, "message": message}
+
+def rpc_ping(backend: SystemBackend) -> dict:
+    return {"app": APP_NAME, "version": APP_VERSION, "pid": os.getpid(), "admin": is_admin(backend)}
+
+def rpc_set_time(backend: SystemBackend, at: str, tolerance_ms: Optional[float] = None) -> dict:
+    # Elapsed time is counted from receipt; clients add their own side before sending
+    return operation_result(apply_system_datetime(
+        datetime.fromisoformat(at), time.monotonic(), tolerance_ms, backend
+    ))
+
+def rpc_offset(backend: SystemBackend, weeks: float = 0, days: float = 0, hours: float = 0,
+               minutes: float = 0, seconds: float = 0) -> dict:
+    # Relative to the clock being changed, so repeated offsets accumulate
+    target = backend.now() + timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+    return operation_result(set_system_datetime(
+        target.year, target.month, target.day, target.hour, target.minute,
+        target.second + target.microsecond / 1e6, backend
+    ))
+
+def rpc_set_tz(backend: SystemBackend, timezone: str) -> dict:
+    record = TimezoneIndex(get_timezone_catalog(backend)).resolve(timezone)
+    if record is None:
+        return {"ok": False, "message": f"Unknown or ambiguous timezone '{timezone}'"}
+    return operation_result(set_timezone(record.id, backend))
+
+def rpc_set_mac(backend: SystemBackend, changes: dict, deadline: float = BOUNCE_DEADLINE) -> dict:
+    results = apply_mac_batch(changes, backend, deadline)
+    return {"ok": all(ok for ok, _ in results.values()),
+            "results": {adapter: operation_result(result) for adapter, result in results.items()}}
+
+def rpc_set_name(backend: SystemBackend, name: str) -> dict:
+    return operation_result(set_computer_name(name, backend))
+
+def rpc_restore_sync(backend: SystemBackend, servers: Optional[list] = None) -> dict:
+    return operation_result(restore_time_sync(backend, servers))
+
+def rpc_status(backend: SystemBackend) -> dict:
+    return {
+        "app": APP_NAME,
+        "version": APP_VERSION,
+        "backend": backend.name,
+        "admin": is_admin(backend),
+        "now": backend.now().isoformat(timespec="seconds"),
+        "computer_name": get_computer_name(backend),
+        "local_ip": get_local_ip(backend),
+        "timezone": get_timezone_info(backend),
+        "adapters": [
+            {"name": a.name, "description": a.description, "mac": a.mac, "guid": a.guid, "enabled": a.enabled}
+            for a in get_adapter_inventory(backend)
+        ],
+    }
+
+def rpc_trace(backend: SystemBackend, spans: bool = False) -> dict:
+    return {"enabled": tracing.is_enabled(), "json": tracing.snapshot(spans),
+            "prometheus": tracing.prometheus_text()}
+
+METHODS = {
+    "ping": rpc_ping,
+    "set_time": rpc_set_time,
+    "offset": rpc_offset,
+    "set_tz": rpc_set_tz,
+    "set_mac": rpc_set_mac,
+    "set_name": rpc_set_name,
+    "restore_sync": rpc_restore_sync,
+    "status": rpc_status,
+    "trace": rpc_trace,
+}
+
+# Read-only methods skip the operation lock
+READ_ONLY_METHODS = {"ping", "status", "trace"}
+
+# ==================== SERVER ====================
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.owner.dispatch(line)
+            if response is None:
+                continue
+            self.wfile.write(json.dumps(response, separators=(',', ':')).encode() + b"\n")
+            self.wfile.flush()
+            if self.server.owner.stopping:
+                break
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class DaemonServer:
+    """JSON-RPC server running operations against one backend
+
+    Mutating operations are serialized; every request must carry the token
+    written to the state file.
+    """
+
+    def __init__(self, backend: Optional[SystemBackend] = None, address: Optional[str] = None,
+                 state_file: Optional[str] = DAEMON_FILE):
+        self.backend = backend or get_backend()
+        self.address = address or default_address()
+        self.state_file = state_file
+        self.token = secrets.token_hex(16)
+        self.requests = 0
+        self.stopping = False
+        self._server = None
+        self._lock = threading.Lock()
+
+    def start(self) -> str:
+        """Bind the socket and publish the state file; returns the bound address"""
+        family, sockaddr = parse_address(self.address)
+        if family == socket.AF_INET:
+            self._server = _TCPServer(sockaddr, _RequestHandler)
+            host, port = self._server.server_address[:2]
+            self.address = f"tcp:{host}:{port}"
+        else:
+            if os.path.exists(sockaddr):
+                if ping(f"unix:{sockaddr}"):
+                    raise DaemonError(f"A daemon is already listening on {sockaddr}")
+                os.unlink(sockaddr)  # Left behind by a daemon that died
+            self._server = _UnixServer(sockaddr, _RequestHandler)
+            os.chmod(sockaddr, 0o600)
+        self._server.owner = self
+
+        if self.state_file:
+            write_state(self.state_file, {"address": self.address, "token": self.token, "pid": os.getpid()})
+        return self.address
+
+    def serve_forever(self):
+        if self._server is None:
+            self.start()
+        try:
+            self._server.serve_forever(poll_interval=0.2)
+        finally:
+            self.close()
+
+    def serve_in_thread(self) -> threading.Thread:
+        """Start serving on a background thread, for embedding the daemon in another process"""
+        if self._server is None:
+            self.start()
+        thread = threading.Thread(target=self.serve_forever, name="clocker-daemon", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        """Stop serving (safe to call from a request handler)"""
+        self.stopping = True
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def close(self):
+        if self._server is None:
+            return
+        self._server.server_close()
+        family, sockaddr = parse_address(self.address)
+        if family != socket.AF_INET:
+            try:
+                os.unlink(sockaddr)
+            except OSError:
+                pass
+        if self.state_file and read_state(self.state_file).get("token") == self.token:
+            try:
+                os.remove(self.state_file)
+            except OSError:
+                pass
+        self._server = None
+
+    def dispatch(self, line: bytes) -> Optional[dict]:
+        """Handle one JSON-RPC request line; returns the response (None for notifications)"""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return _error(None, PARSE_ERROR, f"Parse error: {str(e)}")
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+
+        request_id = request.get("id")
+        if not secrets.compare_digest(str(request.get("token", "")), self.token):
+            return _error(request_id, UNAUTHORIZED, "Invalid or missing token")
+
+        method = request["method"]
+        params = request.get("params") or {}
+        self.requests += 1
+        if method == "shutdown":
+            self.shutdown()
+            result = {"ok": True, "message": "Daemon stopping"}
+        elif method not in METHODS:
+            return _error(request_id, METHOD_NOT_FOUND, f"Unknown method '{method}'")
+        elif not isinstance(params, dict):
+            return _error(request_id, INVALID_PARAMS, "params must be an object")
+        else:
+            try:
+                with tracing.span(method, "rpc"):
+                    if method in READ_ONLY_METHODS:
+                        result = METHODS[method](self.backend, **params)
+                    else:
+                        with self._lock:
+                            result = METHODS[method](self.backend, **params)
+            except (TypeError, ValueError) as e:
+                return _error(request_id, INVALID_PARAMS, str(e))
+            except Exception as e:
+                return _error(request_id, OPERATION_ERROR, f"Error: {str(e)}")
+
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+def _error(request_id, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+def write_state(path: str, state: dict):
+    """Atomically write the daemon state file, readable only by the current user"""
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def read_state(path: str = DAEMON_FILE) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+# ==================== CLIENT ====================
+
+def _invalidate(backend: Optional[SystemBackend], names: tuple):
+    """Drop probes a daemon write made stale; the daemon only clears its own process's cache"""
+    if backend is not None and names:
+        backend.probe_cache.invalidate(*names)
+
+class DaemonClient:
+    """Persistent connection to a running daemon
+
+    Besides ``call``, it mirrors the system.py operation signatures (the
+    trailing ``backend`` argument is ignored) so the GUI can use it in place
+    of the local operations.
+    """
+
+    def __init__(self, address: str, token: str = "", timeout: Optional[float] = None):
+        self.address = address
+        self.token = token
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._next_id = 0
+        self._admin = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_state(cls, path: str = DAEMON_FILE, **kwargs) -> Optional["DaemonClient"]:
+        """Client for the daemon recorded in the state file, or None if it is not reachable"""
+        state = read_state(path)
+        if not state.get("address"):
+            return None
+        client = cls(state["address"], state.get("token", ""), **kwargs)
+        try:
+            client.call("ping")
+        except (DaemonError, OSError):
+            client.close()
+            return None
+        return client
+
+    def _connect(self):
+        family, sockaddr = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(sockaddr)
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(self.timeout)
+        if family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._reader = sock.makefile('rb')
+
+    def call(self, method: str, **params):
+        """Send one request and wait for its result; raises DaemonError on an error response"""
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            self._next_id += 1
+            request = {"jsonrpc": "2.0", "id": self._next_id, "method": method,
+                       "params": params, "token": self.token}
+            try:
+                self._sock.sendall(json.dumps(request, separators=(',', ':')).encode() + b"\n")
+                line = self._reader.readline()
+            except OSError:
+                self.close()
+                raise
+            if not line:
+                self.close()
+                raise DaemonError("Daemon closed the connection")
+
+        response = json.loads(line)
+        if "error" in response:
+            raise DaemonError(response["error"]["message"], response["error"].get("code", OPERATION_ERROR))
+        return response["result"]
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._reader = None
+
+    def _operation(self, method: str, backend=None, invalidates: tuple = (), **params) -> tuple[bool, str]:
+        try:
+            result = self.call(method, **params)
+        except (DaemonError, OSError) as e:
+            return False, f"Error: {str(e)}"
+        finally:
+            _invalidate(backend, invalidates)
+        return result["ok"], result["message"]
+
+    # system.py-compatible operations
+
+    def is_admin(self, backend=None) -> bool:
+        if self._admin is None:
+            try:
+                self._admin = self.call("ping")["admin"]
+            except (DaemonError, OSError):
+                return False
+        return self._admin
+
+    def apply_system_datetime(self, target: datetime, requested_at: Optional[float] = None,
+                              tolerance_ms: Optional[float] = None, backend=None) -> tuple[bool, str]:
+        if requested_at is not None:
+            target += timedelta(seconds=time.monotonic() - requested_at)
+        return self._operation("set_time", at=target.isoformat(), tolerance_ms=tolerance_ms)
+
+    def restore_time_sync(self, backend=None) -> tuple[bool, str]:
+        return self._operation("restore_sync")
+
+    def set_computer_name(self, new_name: str, backend=None) -> tuple[bool, str]:
+        return self._operation("set_name", backend, ("computer_name", "local_ip"), name=new_name)
+
+    def set_timezone(self, timezone: str, backend=None) -> tuple[bool, str]:
+        return self._operation("set_tz", backend, ("timezone",), timezone=timezone)
+
+    def set_mac_address(self, adapter_name: str, new_mac: str, backend=None) -> tuple[bool, str]:
+        return self._mac(adapter_name, new_mac, backend)
+
+    def reset_mac_address(self, adapter_name: str, backend=None) -> tuple[bool, str]:
+        return self._mac(adapter_name, None, backend)
+
+    def _mac(self, adapter_name: str, new_mac: Optional[str], backend=None) -> tuple[bool, str]:
+        try:
+            result = self.call("set_mac", changes={adapter_name: new_mac})
+        except (DaemonError, OSError) as e:
+            return False, f"Error: {str(e)}"
+        finally:
+            _invalidate(backend, ("adapters",))
+        outcome = result["results"][adapter_name]
+        return outcome["ok"], outcome["message"]
+
+class LocalClient:
+    """Runs the daemon methods in-process (the CLI's fallback when no daemon is running)"""
+
+    def __init__(self, backend: Optional[SystemBackend] = None):
+        self.backend = backend or get_backend()
+
+    def call(self, method: str, **params):
+        if method not in METHODS:
+            raise DaemonError(f"Unknown method '{method}'", METHOD_NOT_FOUND)
+        with tracing.span(method, "rpc"):
+            return METHODS[method](self.backend, **params)
+
+    def close(self):
+        pass
+
+def ping(address: str) -> bool:
+    """Whether something accepts connections on ``address``"""
+    family, sockaddr = parse_address(address)
+    try:
+        with socket.socket(family, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(sockaddr)
+        return True
+    except OSError:
+        return False
+
+def find_daemon(path: str = DAEMON_FILE) -> Optional[DaemonClient]:
+    """Client for a running daemon, or None (``CLOCKER_DAEMON=off`` disables discovery)"""
+    if os.environ.get("CLOCKER_DAEMON", "").lower() in ("0", "off", "no"):
+        return None
+    return DaemonClient.from_state(path)
@@ -0,0 +1,154 @@
+"""
+UI dispatcher - lets any thread post widget updates that the Tk thread applies
+in bounded batches, keeping only the latest update per key
+"""
+
+import collections
+import itertools
+import threading
+import time
+import traceback
+from typing import Callable
+
+from .stats import percentile
+from .tracing import span
+
+# Drain latency samples kept for the metrics
+LATENCY_SAMPLES = 512
+
+class UIDispatcher:
+    """Queue of pending UI mutations, drained on the Tk thread from ``after()`` ticks
+
+    ``post`` is safe from any thread. Posts sharing a ``key`` coalesce: the
+    newest callback replaces the queued one but keeps its place in line, so
+    a label updated ten times between ticks is redrawn once. Each tick runs
+    at most ``batch_size`` callbacks and yields back to Tk before the next.
+
+    Posts from the Tk thread schedule a drain right away; posts from other
+    threads are picked up by a poll that runs every ``poll_ms`` while there is
+    traffic and backs off to ``idle_ms`` when there is none.
+    """
+
+    def __init__(self, widget, batch_size: int = 64, poll_ms: int = 16, idle_ms: int = 100):
+        self.widget = widget
+        self.batch_size = batch_size
+        self.poll_ms = poll_ms
+        self.idle_ms = idle_ms
+        self._pending = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._serial = itertools.count()
+        self._tk_thread = threading.get_ident()
+        self._after_id = None
+        self._immediate = False
+        self._interval = poll_ms
+        self._running = False
+
+        self.posted = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.batches = 0
+        self.max_depth = 0
+        self._latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def post(self, callback: Callable, *args, key=None, **kwargs):
+        """Queue ``callback(*args, **kwargs)`` for the Tk thread, replacing any queued post with the same ``key``"""
+        with self._lock:
+            if key is None:
+                key = ("post", next(self._serial))
+            entry = self._pending.get(key)
+            # Coalesced updates keep the original post time, so latency covers the whole wait
+            posted_at = entry[3] if entry is not None else time.perf_counter()
+            self._pending[key] = (callback, args, kwargs, posted_at)
+            self.posted += 1
+            if entry is not None:
+                self.coalesced += 1
+            self.max_depth = max(self.max_depth, len(self._pending))
+        if threading.get_ident() == self._tk_thread:
+            self._schedule(0)
+
+    def start(self):
+        """Begin draining (the poll keeps running until ``stop``)"""
+        if self._running:
+            return
+        self._running = True
+        self._interval = self.poll_ms
+        self._schedule(0)
+
+    def stop(self):
+        """Stop draining; queued posts stay queued until the next ``start``"""
+        self._running = False
+        self._cancel()
+
+    def discard(self):
+        """Stop and drop everything still queued"""
+        self.stop()
+        with self._lock:
+            self._pending.clear()
+
+    def _schedule(self, delay_ms: int):
+        if not self._running:
+            return
+        if self._after_id is not None:
+            if delay_ms > 0 or self._immediate:
+                return
+            # A Tk-thread post should not wait out an idle poll
+            self._cancel()
+        self._immediate = delay_ms == 0
+        self._after_id = self.widget.after(delay_ms, self._drain) if delay_ms else self.widget.after_idle(self._drain)
+
+    def _cancel(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _drain(self):
+        self._after_id = None
+        if not self._running:
+            return
+        with self._lock:
+            batch = [self._pending.popitem(last=False)[1]
+                     for _ in range(min(self.batch_size, len(self._pending)))]
+            remaining = len(self._pending)
+
+        if batch:
+            now = time.perf_counter()
+            with span("ui_dispatch", "ui", f"{len(batch)} updates"):
+                for callback, args, kwargs, posted_at in batch:
+                    self._latencies.append(now - posted_at)
+                    try:
+                        callback(*args, **kwargs)
+                    except Exception:
+                        traceback.print_exc()
+            self.applied += len(batch)
+            self.batches += 1
+
+        if remaining:
+            # Let Tk handle input and redraws between batches
+            self._schedule(1)
+            return
+        self._interval = self.poll_ms if batch else min(self._interval * 2, self.idle_ms)
+        self._schedule(self._interval)
+
+    def metrics(self) -> dict:
+        """Queue depth, coalescing and post-to-apply latency (milliseconds)"""
+        latencies = list(self._latencies)
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "posted": self.posted,
+            "coalesced": self.coalesced,
+            "applied": self.applied,
+            "batches": self.batches,
+            "drain_latency_ms": {
+                "p50": percentile(latencies, 50) * 1000,
+                "p95": percentile(latencies, 95) * 1000,
+                "max": max(latencies, default=0.0) * 1000,
+            },
+        }
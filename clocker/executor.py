@@ -0,0 +1,98 @@
+"""
+Operation executor - runs system operations on a worker pool and hands the
+results back to the Tk thread, so the mainloop never blocks on a subprocess
+"""
+
+import queue
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .tracing import bind, span
+
+class OperationExecutor:
+    """Worker pool returning futures, plus a completion queue drained on the Tk thread
+
+    ``submit`` must be called from the Tk thread. Completion callbacks always
+    run on the Tk thread, from an ``after()`` poll that is only scheduled
+    while work is in flight.
+    """
+
+    def __init__(self, widget, max_workers: int = 4, poll_ms: int = 25):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="clocker-op")
+        self._completions = queue.SimpleQueue()
+        self._in_flight = {}
+        self._outstanding = 0
+        self._after_id = None
+        self._running = True
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, on_done: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, key: Optional[str] = None, **kwargs) -> Future:
+        """Run ``fn(*args, **kwargs)`` on a worker; callbacks receive the result or exception
+
+        Work submitted with a ``key`` that is already in flight is not started
+        twice - the existing future is returned instead.
+        """
+        if key is not None and key in self._in_flight:
+            return self._in_flight[key]
+
+        future = self._pool.submit(bind(fn), *args, **kwargs)
+        if key is not None:
+            self._in_flight[key] = future
+        with self._lock:
+            self._outstanding += 1
+        future.add_done_callback(lambda f: self._completions.put((f, key, on_done, on_error)))
+        self._schedule()
+        return future
+
+    def busy(self, key: str) -> bool:
+        """Whether work submitted under ``key`` is still in flight"""
+        return key in self._in_flight
+
+    def _schedule(self):
+        if self._running and self._after_id is None:
+            self._after_id = self.widget.after(self.poll_ms, self._drain)
+
+    def _drain(self):
+        self._after_id = None
+        while self._running:
+            try:
+                future, key, on_done, on_error = self._completions.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._outstanding -= 1
+            if key is not None:
+                self._in_flight.pop(key, None)
+            try:
+                with span(key or "completion", "ui"):
+                    error = future.exception()
+                    if error is None:
+                        if on_done:
+                            on_done(future.result())
+                    elif on_error:
+                        on_error(error)
+                    else:
+                        traceback.print_exception(type(error), error, error.__traceback__)
+            except Exception:
+                traceback.print_exc()
+
+        with self._lock:
+            outstanding = self._outstanding
+        if outstanding > 0:
+            self._schedule()
+
+    def shutdown(self):
+        """Stop delivering completions and abandon queued work"""
+        self._running = False
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
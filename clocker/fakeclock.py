@@ -0,0 +1,297 @@
+"""
+Fake clock - per-process virtual time for test suites, without touching the
+system clock or needing admin rights
+
+Patches ``time.time``, ``time.time_ns``, ``datetime.now/utcnow/today`` and
+``date.today`` (``time.monotonic`` and ``perf_counter`` are left alone so
+timeouts keep working). Offsets use the same vocabulary as the GUI presets:
+
+    with fake_time("2027-02-28 23:59:50"):          # frozen
+        ...
+    with fake_time(days=1):                         # offset, ticking from now + 1 day
+        ...
+    with fake_time("2027-01-01", tick=True):        # ticking from a start date
+        ...
+
+    @fake_time(weeks=-1)
+    def test_last_week(): ...
+
+A process started with ``fake_env(spec)`` (``CLOCKER_FAKE_TIME=<spec>``) runs
+under the fake clock from interpreter start; see ``parse_spec``.
+"""
+
+import contextlib
+import datetime as _datetime_module
+import os
+import re
+import sys
+import time
+from datetime import timedelta, timezone
+from typing import Optional
+
+ENV_VAR = "CLOCKER_FAKE_TIME"
+BOOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_boot")
+
+_real_time = time.time
+_real_time_ns = time.time_ns
+_real_date = _datetime_module.date
+_real_datetime = _datetime_module.datetime
+
+# Active clock parameters: fake = anchor_fake + (real - anchor_real) * rate
+_anchor_real = 0.0
+_anchor_fake = 0.0
+_anchor_real_ns = 0
+_anchor_fake_ns = 0
+_rate = 1.0
+
+def _fake_time() -> float:
+    return _anchor_fake + (_real_time() - _anchor_real) * _rate
+
+def _fake_time_ns() -> int:
+    return _anchor_fake_ns + int((_real_time_ns() - _anchor_real_ns) * _rate)
+
+class _FakeType(type):
+    """Lets real date/datetime instances pass isinstance checks against the fakes"""
+
+    def __instancecheck__(cls, obj):
+        return isinstance(obj, cls._real)
+
+    def __subclasscheck__(cls, subclass):
+        return issubclass(subclass, cls._real)
+
+class FakeDate(_real_date, metaclass=_FakeType):
+    _real = _real_date
+
+    @classmethod
+    def today(cls):
+        return cls.fromtimestamp(_fake_time())
+
+class FakeDatetime(_real_datetime, metaclass=_FakeType):
+    _real = _real_datetime
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.fromtimestamp(_fake_time(), tz)
+
+    @classmethod
+    def utcnow(cls):
+        return cls.fromtimestamp(_fake_time(), timezone.utc).replace(tzinfo=None)
+
+    @classmethod
+    def today(cls):
+        return cls.fromtimestamp(_fake_time())
+
+# ==================== PATCHING ====================
+
+_REPLACEMENTS = (
+    (_real_time, _fake_time),
+    (_real_time_ns, _fake_time_ns),
+    (_real_date, FakeDate),
+    (_real_datetime, FakeDatetime),
+)
+
+# Patched directly (or C internals that must keep the real objects)
+_UNSWAPPED_MODULES = {__name__, "time", "datetime", "_datetime", "_pydatetime"}
+
+def _swap_references(forward: bool):
+    """Rebind module-level references (``from time import time`` etc.) across loaded modules"""
+    mapping = {id(old if forward else new): (new if forward else old) for old, new in _REPLACEMENTS}
+    for name, module in list(sys.modules.items()):
+        if module is None or name in _UNSWAPPED_MODULES:
+            continue
+        try:
+            namespace = vars(module)
+        except TypeError:
+            continue
+        for attr, value in list(namespace.items()):
+            replacement = mapping.get(id(value))
+            if replacement is not None and (value is not replacement):
+                try:
+                    setattr(module, attr, replacement)
+                except (AttributeError, TypeError):
+                    pass
+
+def _patch():
+    time.time = _fake_time
+    time.time_ns = _fake_time_ns
+    _datetime_module.date = FakeDate
+    _datetime_module.datetime = FakeDatetime
+    _swap_references(True)
+
+def _unpatch():
+    time.time = _real_time
+    time.time_ns = _real_time_ns
+    _datetime_module.date = _real_date
+    _datetime_module.datetime = _real_datetime
+    _swap_references(False)
+
+_active = []
+
+def _apply(clock: "FakeClock"):
+    global _anchor_real, _anchor_fake, _anchor_real_ns, _anchor_fake_ns, _rate
+    _anchor_real_ns = clock._anchor_real_ns
+    _anchor_fake_ns = clock._anchor_fake_ns
+    _anchor_real = _anchor_real_ns / 1e9
+    _anchor_fake = _anchor_fake_ns / 1e9
+    _rate = clock.rate
+
+def active_clock() -> Optional["FakeClock"]:
+    """The innermost running FakeClock, if any"""
+    return _active[-1] if _active else None
+
+# ==================== CLOCKS ====================
+
+def to_timestamp(at) -> float:
+    """Epoch seconds for a datetime/date (naive = local time), ISO string or number"""
+    if isinstance(at, (int, float)):
+        return float(at)
+    if isinstance(at, str):
+        at = _real_datetime.fromisoformat(at.strip())
+    if isinstance(at, _real_datetime):
+        return at.timestamp()
+    if isinstance(at, _real_date):
+        return _real_datetime(at.year, at.month, at.day).timestamp()
+    raise TypeError(f"Cannot convert {at!r} to a timestamp")
+
+class FakeClock(contextlib.ContextDecorator):
+    """Virtual wall clock: ``at`` (or real now) + offset, advancing at ``rate`` (0 = frozen)
+
+    Usable as a context manager, a decorator, or via ``start()``/``stop()``.
+    Clocks nest; stopping the innermost one reinstates the previous.
+    """
+
+    def __init__(self, at=None, rate: float = 0.0, offset: timedelta = timedelta()):
+        self.at = None if at is None else to_timestamp(at)
+        self.rate = rate
+        self.offset = offset
+        self._anchor_real_ns = 0
+        self._anchor_fake_ns = 0
+
+    @classmethod
+    def frozen(cls, at) -> "FakeClock":
+        return cls(at, rate=0.0)
+
+    @classmethod
+    def shifted(cls, weeks=0, days=0, hours=0, minutes=0, seconds=0) -> "FakeClock":
+        """Real time plus an offset, ticking normally"""
+        return cls(None, 1.0, timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds))
+
+    @classmethod
+    def ticking(cls, at, rate: float = 1.0) -> "FakeClock":
+        return cls(at, rate=rate)
+
+    @property
+    def running(self) -> bool:
+        return self in _active
+
+    def time(self) -> float:
+        """Current fake epoch seconds (valid once started)"""
+        return self._anchor_fake_ns / 1e9 + (_real_time_ns() - self._anchor_real_ns) / 1e9 * self.rate
+
+    def now(self) -> _real_datetime:
+        return _real_datetime.fromtimestamp(self.time())
+
+    def start(self) -> "FakeClock":
+        self._anchor_real_ns = _real_time_ns()
+        base_ns = self._anchor_real_ns if self.at is None else int(self.at * 1e9)
+        self._anchor_fake_ns = base_ns + int(self.offset.total_seconds() * 1e9)
+        if not _active:
+            _patch()
+        _active.append(self)
+        _apply(self)
+        return self
+
+    def stop(self):
+        if self not in _active:
+            return
+        # Remove the most recent activation (a decorated function may re-enter)
+        del _active[len(_active) - 1 - _active[::-1].index(self)]
+        if _active:
+            _apply(_active[-1])
+        else:
+            _unpatch()
+
+    def advance(self, weeks=0, days=0, hours=0, minutes=0, seconds=0):
+        """Move this clock forward (or back, with negative values) without changing its rate"""
+        delta = timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+        self._anchor_fake_ns += int(delta.total_seconds() * 1e9)
+        if active_clock() is self:
+            _apply(self)
+
+    def move_to(self, at):
+        """Jump this clock to ``at`` from now on"""
+        self._anchor_real_ns = _real_time_ns()
+        self._anchor_fake_ns = int(to_timestamp(at) * 1e9)
+        if active_clock() is self:
+            _apply(self)
+
+    def __enter__(self) -> "FakeClock":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+def fake_time(at=None, *, tick: bool = False, rate: float = 1.0,
+              weeks=0, days=0, hours=0, minutes=0, seconds=0) -> FakeClock:
+    """FakeClock from the GUI offset vocabulary
+
+    With ``at``: frozen there (ticking when ``tick``), shifted by any offset.
+    Without ``at``: real time shifted by the offset, ticking at ``rate``.
+    """
+    offset = timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+    if at is None:
+        return FakeClock(None, rate, offset)
+    return FakeClock(at, rate if tick else 0.0, offset)
+
+# ==================== ENVIRONMENT ====================
+
+_OFFSET_SPEC = re.compile(r"^([+-]?)((?:\d+(?:\.\d+)?[wdhms])+)$")
+_OFFSET_PART = re.compile(r"(\d+(?:\.\d+)?)([wdhms])")
+_UNITS = {"w": "weeks", "d": "days", "h": "hours", "m": "minutes", "s": "seconds"}
+
+def parse_offset(text: str) -> timedelta:
+    """Timedelta from a compact offset like ``1d``, ``-2w3d`` or ``+90m``"""
+    match = _OFFSET_SPEC.match(text.replace(" ", ""))
+    if not match:
+        raise ValueError(f"Invalid offset '{text}'. Use e.g. 1d, -2w3d, +90m")
+    units = {}
+    for amount, unit in _OFFSET_PART.findall(match.group(2)):
+        units[_UNITS[unit]] = units.get(_UNITS[unit], 0) + float(amount)
+    delta = timedelta(**units)
+    return -delta if match.group(1) == "-" else delta
+
+def parse_spec(spec: str) -> FakeClock:
+    """FakeClock from a ``CLOCKER_FAKE_TIME`` spec
+
+    ``+1d`` / ``-2w3d`` / ``+90m``      real time shifted, ticking
+    ``2027-02-28T23:59:50``            frozen
+    ``2027-02-28T23:59:50 tick``       ticking from there (``tick:10`` = 10x speed)
+    """
+    spec = spec.strip()
+    if spec[:1] in ("+", "-"):
+        return FakeClock(None, 1.0, parse_offset(spec))
+
+    at, tick, mode = spec.partition(" tick")
+    if tick and mode[:1] not in ("", ":"):
+        raise ValueError(f"Invalid fake time spec '{spec}'")
+    if not tick:
+        return fake_time(at)
+    return fake_time(at, tick=True, rate=float(mode[1:]) if mode else 1.0)
+
+def install_from_env(environ=None) -> Optional[FakeClock]:
+    """Start the clock described by CLOCKER_FAKE_TIME, if set"""
+    spec = (environ if environ is not None else os.environ).get(ENV_VAR, "").strip()
+    if not spec:
+        return None
+    return parse_spec(spec).start()
+
+def fake_env(spec: str, env: Optional[dict] = None) -> dict:
+    """Environment for a child Python process that starts under the fake clock ``spec``"""
+    parse_spec(spec)  # Fail early on a bad spec
+    env = dict(os.environ if env is None else env)
+    package_root = os.path.dirname(os.path.dirname(BOOT_DIR))
+    paths = [BOOT_DIR, package_root] + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p]
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    env[ENV_VAR] = spec
+    return env
@@ -1,30 +1,29 @@
 """
-Clocker - System Time & Date Faker
-A modern, elegant Windows utility for system time manipulation
+Clocker GUI - CustomTkinter interface
 """
 
 import customtkinter as ctk
 from datetime import datetime, timedelta
-import subprocess
-import ctypes
-import sys
-import os
-import json
+import time
 import hashlib
-import socket
-import winreg
 from typing import Optional
-import threading
-import time
-import re
-import random
 from tkcalendar import Calendar
 
-# ==================== CONFIGURATION ====================
-APP_NAME = "Clocker"
-APP_VERSION = "1.0.0"
-PASSWORD_HASH = hashlib.sha256("kali2003".encode()).hexdigest()
-CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clocker_config.json")
+from . import APP_NAME, APP_VERSION
+from .backend import SystemBackend, get_backend
+from .stats import percentile
+from .clockrate import ClockRateDriver
+from .dispatch import UIDispatcher
+from .executor import OperationExecutor
+from .timezones import TimezoneIndex
+from .tracing import traced
+from . import system
+from .daemon import find_daemon
+from .system import (
+    PASSWORD_HASH, MAC_PATTERN, APPLY_TOLERANCE_MS, is_admin, run_as_admin, get_computer_name, get_local_ip,
+    get_timezone_info, get_timezone_catalog, get_network_adapters, get_adapter_inventory,
+    generate_random_mac, load_config, prefetch_probes
+)
 
 # ==================== THEME CONFIGURATION ====================
 COLORS = {
@@ -46,303 +45,11 @@ COLORS = {
     "gradient_end": "#8b5cf6"
 }
 
-# ==================== UTILITY FUNCTIONS ====================
-
-def is_admin() -> bool:
-    """Check if running with administrator privileges"""
-    try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except:
-        return False
-
-def run_as_admin():
-    """Restart the script with admin privileges"""
-    if sys.platform == 'win32':
-        ctypes.windll.shell32.ShellExecuteW(
-            None, "runas", sys.executable, " ".join(sys.argv), None, 1
-        )
-        sys.exit()
-
-def set_system_datetime(year: int, month: int, day: int, hour: int, minute: int, second: int) -> tuple[bool, str]:
-    """Set the Windows system date and time"""
-    try:
-        # Disable automatic time sync first
-        subprocess.run(
-            ['sc', 'stop', 'w32time'],
-            capture_output=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        subprocess.run(
-            ['w32tm', '/unregister'],
-            capture_output=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        
-        # Format date and time for Windows commands
-        date_str = f"{month:02d}-{day:02d}-{year}"
-        time_str = f"{hour:02d}:{minute:02d}:{second:02d}"
-        
-        # Set date
-        date_result = subprocess.run(
-            ['cmd', '/c', 'date', date_str],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        
-        # Set time
-        time_result = subprocess.run(
-            ['cmd', '/c', 'time', time_str],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        
-        # Also use PowerShell as backup method
-        ps_command = f"Set-Date -Date '{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}'"
-        subprocess.run(
-            ['powershell', '-Command', ps_command],
-            capture_output=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        
-        return True, "Date and time changed successfully!"
-    except Exception as e:
-        return False, f"Error: {str(e)}"
-
-def restore_time_sync() -> tuple[bool, str]:
-    """Re-enable Windows time synchronization"""
-    try:
-        subprocess.run(
-            ['w32tm', '/register'],
-            capture_output=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        subprocess.run(
-            ['sc', 'start', 'w32time'],
-            capture_output=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        subprocess.run(
-            ['w32tm', '/resync', '/nowait'],
-            capture_output=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        return True, "Time sync restored successfully!"
-    except Exception as e:
-        return False, f"Error: {str(e)}"
-
-def get_computer_name() -> str:
-    """Get current computer name"""
-    return socket.gethostname()
-
-def set_computer_name(new_name: str) -> tuple[bool, str]:
-    """Change computer name (requires restart)"""
-    try:
-        key = winreg.OpenKey(
-            winreg.HKEY_LOCAL_MACHINE,
-            r"SYSTEM\CurrentControlSet\Control\ComputerName\ComputerName",
-            0, winreg.KEY_SET_VALUE
-        )
-        winreg.SetValueEx(key, "ComputerName", 0, winreg.REG_SZ, new_name)
-        winreg.CloseKey(key)
-        
-        key = winreg.OpenKey(
-            winreg.HKEY_LOCAL_MACHINE,
-            r"SYSTEM\CurrentControlSet\Control\ComputerName\ActiveComputerName",
-            0, winreg.KEY_SET_VALUE
-        )
-        winreg.SetValueEx(key, "ComputerName", 0, winreg.REG_SZ, new_name)
-        winreg.CloseKey(key)
-        
-        return True, f"Computer name changed to '{new_name}'. Restart required."
-    except Exception as e:
-        return False, f"Error: {str(e)}"
-
-def get_timezone_info() -> str:
-    """Get current timezone"""
-    try:
-        result = subprocess.run(
-            ['tzutil', '/g'],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        return result.stdout.strip()
-    except:
-        return "Unknown"
-
-def get_available_timezones() -> list:
-    """Get list of available timezones"""
-    try:
-        result = subprocess.run(
-            ['tzutil', '/l'],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        lines = result.stdout.strip().split('\n')
-        timezones = [line.strip() for line in lines if line.strip() and not line.startswith('(')]
-        return timezones[:50]  # Limit to 50 for performance
-    except:
-        return ["UTC", "Pacific Standard Time", "Eastern Standard Time", "Central Standard Time"]
-
-def set_timezone(timezone: str) -> tuple[bool, str]:
-    """Set system timezone"""
-    try:
-        result = subprocess.run(
-            ['tzutil', '/s', timezone],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        if result.returncode == 0:
-            return True, f"Timezone changed to '{timezone}'"
-        return False, f"Failed to change timezone: {result.stderr}"
-    except Exception as e:
-        return False, f"Error: {str(e)}"
-
-def get_network_adapters() -> list:
-    """Get list of network adapters with their MAC addresses"""
-    adapters = []
-    try:
-        result = subprocess.run(
-            ['getmac', '/v', '/fo', 'csv'],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
-        lines = result.stdout.strip().split('\n')[1:]  # Skip header
-        for line in lines:
-            parts = line.replace('"', '').split(',')
-            if len(parts) >= 3 and parts[2] != 'N/A':
-                adapters.append({
-                    'name': parts[0],
-                    'transport': parts[1],
-                    'mac': parts[2]
-                })
-    except:
-        pass
-    return adapters
-
-def generate_random_mac() -> str:
-    """Generate a random MAC address"""
-    mac = [0x00, 0x16, 0x3e,
-           random.randint(0x00, 0x7f),
-           random.randint(0x00, 0xff),
-           random.randint(0x00, 0xff)]
-    return '-'.join(map(lambda x: "%02X" % x, mac))
-
-def set_mac_address(adapter_name: str, new_mac: str) -> tuple[bool, str]:
-    """Set MAC address for a network adapter"""
-    try:
-        # Clean MAC address format
-        new_mac_clean = new_mac.replace('-', '').replace(':', '')
-        
-        # Find adapter in registry
-        reg_path = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e972-e325-11ce-bfc1-08002be10318}"
-        
-        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
-        
-        for i in range(100):
-            try:
-                subkey_name = winreg.EnumKey(key, i)
-                subkey_path = f"{reg_path}\\{subkey_name}"
-                subkey = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, subkey_path, 0, winreg.KEY_ALL_ACCESS)
-                
-                try:
-                    desc = winreg.QueryValueEx(subkey, "DriverDesc")[0]
-                    if adapter_name.lower() in desc.lower():
-                        winreg.SetValueEx(subkey, "NetworkAddress", 0, winreg.REG_SZ, new_mac_clean)
-                        winreg.CloseKey(subkey)
-                        
-                        # Disable and re-enable adapter
-                        subprocess.run(
-                            ['netsh', 'interface', 'set', 'interface', adapter_name, 'disable'],
-                            capture_output=True,
-                            creationflags=subprocess.CREATE_NO_WINDOW
-                        )
-                        time.sleep(1)
-                        subprocess.run(
-                            ['netsh', 'interface', 'set', 'interface', adapter_name, 'enable'],
-                            capture_output=True,
-                            creationflags=subprocess.CREATE_NO_WINDOW
-                        )
-                        
-                        return True, f"MAC address changed to {new_mac}. Adapter restarted."
-                except:
-                    pass
-                winreg.CloseKey(subkey)
-            except:
-                break
-        
-        winreg.CloseKey(key)
-        return False, "Adapter not found in registry"
-    except Exception as e:
-        return False, f"Error: {str(e)}"
-
-def reset_mac_address(adapter_name: str) -> tuple[bool, str]:
-    """Reset MAC address to original"""
-    try:
-        reg_path = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e972-e325-11ce-bfc1-08002be10318}"
-        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
-        
-        for i in range(100):
-            try:
-                subkey_name = winreg.EnumKey(key, i)
-                subkey_path = f"{reg_path}\\{subkey_name}"
-                subkey = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, subkey_path, 0, winreg.KEY_ALL_ACCESS)
-                
-                try:
-                    desc = winreg.QueryValueEx(subkey, "DriverDesc")[0]
-                    if adapter_name.lower() in desc.lower():
-                        try:
-                            winreg.DeleteValue(subkey, "NetworkAddress")
-                        except:
-                            pass
-                        winreg.CloseKey(subkey)
-                        
-                        subprocess.run(
-                            ['netsh', 'interface', 'set', 'interface', adapter_name, 'disable'],
-                            capture_output=True,
-                            creationflags=subprocess.CREATE_NO_WINDOW
-                        )
-                        time.sleep(1)
-                        subprocess.run(
-                            ['netsh', 'interface', 'set', 'interface', adapter_name, 'enable'],
-                            capture_output=True,
-                            creationflags=subprocess.CREATE_NO_WINDOW
-                        )
-                        
-                        return True, "MAC address reset to original."
-                except:
-                    pass
-                winreg.CloseKey(subkey)
-            except:
-                break
-        
-        winreg.CloseKey(key)
-        return False, "Adapter not found"
-    except Exception as e:
-        return False, f"Error: {str(e)}"
+# Timezone picker shows at most this many matches while filtering
+TIMEZONE_DROPDOWN_LIMIT = 20
 
-def load_config() -> dict:
-    """Load saved configuration"""
-    try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                return json.load(f)
-    except:
-        pass
-    return {"original_datetime": None, "locked": True}
-
-def save_config(config: dict):
-    """Save configuration"""
-    try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
-    except:
-        pass
+# The clock ticker wakes this long after each second boundary, so the second has surely turned over
+CLOCK_TICK_SLACK_MS = 5
 
 # ==================== CUSTOM WIDGETS ====================
 
@@ -425,9 +132,10 @@ class Card(ctk.CTkFrame):
         )
 
 class StatusIndicator(ctk.CTkFrame):
-    """Status indicator with colored dot"""
-    def __init__(self, master, text, status="info"):
+    """Status indicator with colored dot; updates go through ``dispatcher`` when given"""
+    def __init__(self, master, text, status="info", dispatcher: Optional[UIDispatcher] = None):
         super().__init__(master, fg_color="transparent")
+        self.dispatcher = dispatcher
         
         colors = {
             "success": COLORS["success"],
@@ -448,6 +156,12 @@ class StatusIndicator(ctk.CTkFrame):
         self.label.pack(side="left")
     
     def update_status(self, text: str, status: str):
+        if self.dispatcher is not None:
+            self.dispatcher.post(self.apply_status, text, status, key=("status", id(self)))
+        else:
+            self.apply_status(text, status)
+    
+    def apply_status(self, text: str, status: str):
         colors = {
             "success": COLORS["success"],
             "warning": COLORS["warning"],
@@ -576,12 +290,33 @@ class LoginScreen(ctk.CTkFrame):
 
 class MainApp(ctk.CTkFrame):
     """Main application interface"""
-    def __init__(self, master):
+    def __init__(self, master, backend: Optional[SystemBackend] = None, ops=None):
         super().__init__(master, fg_color=COLORS["bg_dark"])
+        self.backend = backend or get_backend()
+        # Mutating operations: the system module, or a DaemonClient with the same signatures
+        self.ops = ops or system
         self.config = load_config()
         self.current_time_label = None
+        self.current_date_label = None
+        self.clock_after_id = None
+        self.clock_time_text = None
+        self.clock_day = None
         self.running = True
+        self.paused = False
+        self.ui = UIDispatcher(self)
+        self.executor = OperationExecutor(self)
+        self.rate_driver = None
+        self.rate_status_after_id = None
+        self.unlock_ms = []
+        self.tab_placeholders = {}
+        self.tab_build_ms = {}
+        self.timing_label = None
+        self.startup_ms = None
+        
+        start = time.perf_counter()
         self.setup_ui()
+        self.startup_ms = (time.perf_counter() - start) * 1000
+        self.ui.start()
         self.start_clock_update()
     
     def setup_ui(self):
@@ -612,8 +347,8 @@ class MainApp(ctk.CTkFrame):
         # Admin status
         admin_status = StatusIndicator(
             header,
-            "Administrator" if is_admin() else "Standard User",
-            "success" if is_admin() else "warning"
+            "Administrator" if self.ops.is_admin(self.backend) else "Standard User",
+            "success" if self.ops.is_admin(self.backend) else "warning"
         )
         admin_status.pack(side="right", pady=20)
         
@@ -627,20 +362,107 @@ class MainApp(ctk.CTkFrame):
             segmented_button_unselected_color=COLORS["bg_card"],
             segmented_button_unselected_hover_color=COLORS["bg_card_hover"],
             text_color=COLORS["text_secondary"],
-            corner_radius=12
+            corner_radius=12,
+            command=self.on_tab_change
         )
         self.tab_view.pack(fill="both", expand=True, padx=24, pady=16)
         
-        # Create tabs
+        # Create tabs - only the first one is built now, the rest on first view
         self.datetime_tab = self.tab_view.add("⏰ Date & Time")
         self.system_tab = self.tab_view.add("💻 System")
         self.network_tab = self.tab_view.add("🌐 Network")
         self.settings_tab = self.tab_view.add("⚙️ Settings")
         
-        self.setup_datetime_tab()
-        self.setup_system_tab()
-        self.setup_network_tab()
-        self.setup_settings_tab()
+        self.tab_builders = {
+            "⏰ Date & Time": self.setup_datetime_tab,
+            "💻 System": self.setup_system_tab,
+            "🌐 Network": self.setup_network_tab,
+            "⚙️ Settings": self.setup_settings_tab,
+        }
+        for name in list(self.tab_builders)[1:]:
+            self.show_tab_placeholder(name)
+        self.build_tab("⏰ Date & Time")
+    
+    def show_tab_placeholder(self, name: str):
+        """Show a lightweight skeleton card until the tab is built"""
+        skeleton = Card(self.tab_view.tab(name))
+        skeleton.pack(fill="x")
+        ModernLabel(skeleton, text="Loading...", variant="muted").pack(anchor="w", padx=24, pady=20)
+        self.tab_placeholders[name] = skeleton
+    
+    def on_tab_change(self):
+        """Build the selected tab the first time it is shown"""
+        name = self.tab_view.get()
+        if name in self.tab_builders and name not in self.tab_build_ms:
+            # Let the skeleton paint before the widgets are created
+            self.after_idle(lambda: self.build_tab(name))
+        else:
+            self.update_timing_report()
+    
+    @traced(kind="ui")
+    def build_tab(self, name: str):
+        """Run a tab's setup method once and record how long it took"""
+        if name in self.tab_build_ms or not self.running:
+            return
+        
+        start = time.perf_counter()
+        placeholder = self.tab_placeholders.pop(name, None)
+        if placeholder is not None:
+            placeholder.destroy()
+        self.tab_builders[name]()
+        self.tab_build_ms[name] = (time.perf_counter() - start) * 1000
+        self.update_timing_report()
+    
+    def startup_report(self) -> dict:
+        """Per-tab build cost: what was paid at startup and what lazy building saved"""
+        first_tab = next(iter(self.tab_builders))
+        resumes = self.unlock_ms[1:]
+        return {
+            "startup_ms": round(self.startup_ms, 1) if self.startup_ms is not None else None,
+            "unlock": {
+                "first_ms": round(self.unlock_ms[0], 1) if self.unlock_ms else None,
+                "resume_p50_ms": round(percentile(resumes, 50), 1) if resumes else None,
+                "resume_max_ms": round(max(resumes), 1) if resumes else None,
+                "resumes": len(resumes),
+            },
+            "tabs": {
+                name: {
+                    "built": name in self.tab_build_ms,
+                    "build_ms": round(self.tab_build_ms[name], 1) if name in self.tab_build_ms else None,
+                    "deferred": name != first_tab,
+                }
+                for name in self.tab_builders
+            },
+        }
+    
+    def update_timing_report(self):
+        """Refresh the startup timing card in the Settings tab"""
+        if self.timing_label is None:
+            return
+        
+        report = self.startup_report()
+        lines = []
+        if report["startup_ms"] is not None:
+            lines.append(f"Main window built in {report['startup_ms']:.0f} ms")
+        for name, row in report["tabs"].items():
+            if not row["deferred"]:
+                lines.append(f"{name}: {row['build_ms']:.0f} ms at startup")
+            elif row["built"]:
+                lines.append(f"{name}: {row['build_ms']:.0f} ms saved at startup (built on first view)")
+            else:
+                lines.append(f"{name}: not built yet")
+        unlock = report["unlock"]
+        if unlock["first_ms"] is not None:
+            line = f"Unlock: {unlock['first_ms']:.0f} ms building the window"
+            if unlock["resumes"]:
+                line += (f", {unlock['resume_p50_ms']:.0f} ms resuming it "
+                         f"(p50 of {unlock['resumes']}, max {unlock['resume_max_ms']:.0f} ms)")
+            lines.append(line)
+        queue = self.ui.metrics()
+        lines.append(f"UI queue: {queue['depth']} pending (max {queue['max_depth']}), "
+                     f"{queue['coalesced']} of {queue['posted']} updates coalesced, "
+                     f"drain p95 {queue['drain_latency_ms']['p95']:.1f} ms")
+        self.timing_label.configure(text="\n".join(lines))
     
     def setup_datetime_tab(self):
         """Setup Date & Time faker tab"""
@@ -822,9 +644,56 @@ class MainApp(ctk.CTkFrame):
         self.restore_btn.pack(side="left")
         
         # Status message
-        self.datetime_status = StatusIndicator(custom_inner, "Ready", "info")
+        self.datetime_status = StatusIndicator(custom_inner, "Ready", "info", self.ui)
         self.datetime_status.pack(anchor="w", pady=(16, 0))
         
+        # Clock Rate Card
+        rate_card = Card(container)
+        rate_card.pack(fill="x", pady=(0, 16))
+        
+        rate_inner = ctk.CTkFrame(rate_card, fg_color="transparent")
+        rate_inner.pack(padx=24, pady=20, fill="x")
+        
+        ctk.CTkLabel(
+            rate_inner,
+            text="Clock Rate",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLORS["text_primary"]
+        ).pack(anchor="w", pady=(0, 4))
+        
+        ModernLabel(
+            rate_inner,
+            text="Run the system clock faster or slower than real time (e.g. 10× or 0.5×)",
+            variant="muted"
+        ).pack(anchor="w", pady=(0, 12))
+        
+        rate_row = ctk.CTkFrame(rate_inner, fg_color="transparent")
+        rate_row.pack(fill="x", pady=(0, 12))
+        
+        self.rate_entries = {}
+        for key, label, default in (("rate", "Rate (×)", "10"), ("interval", "Step every (s)", "1"),
+                                    ("max_step", "Max step (s)", "")):
+            field = ctk.CTkFrame(rate_row, fg_color="transparent")
+            field.pack(side="left", padx=(0, 12))
+            ModernLabel(field, text=label, variant="muted").pack(anchor="w")
+            entry = ModernEntry(field, placeholder="none" if not default else default, width=100)
+            entry.pack()
+            if default:
+                entry.insert(0, default)
+            self.rate_entries[key] = entry
+        
+        self.rate_btn = ModernButton(
+            rate_inner,
+            text="▶ Start",
+            command=self.toggle_clock_rate,
+            variant="secondary",
+            width=160
+        )
+        self.rate_btn.pack(anchor="w")
+        
+        self.rate_status = ModernLabel(rate_inner, text="", variant="muted", justify="left")
+        self.rate_status.pack(anchor="w", pady=(12, 0))
+        
         # Warning card
         warning_card = Card(container)
         warning_card.pack(fill="x")
@@ -877,10 +746,10 @@ class MainApp(ctk.CTkFrame):
             width=80
         ).pack(side="right")
         
-        self.original_computer_name = get_computer_name()
+        self.original_computer_name = get_computer_name(self.backend)
         current_name = ModernLabel(
             name_inner,
-            text=f"Current: {get_computer_name()}",
+            text=f"Current: {get_computer_name(self.backend)}",
             variant="secondary"
         )
         current_name.pack(anchor="w", pady=(0, 12))
@@ -927,10 +796,10 @@ class MainApp(ctk.CTkFrame):
             width=80
         ).pack(side="right")
         
-        self.original_timezone = get_timezone_info()
+        self.original_timezone = get_timezone_info(self.backend)
         self.current_tz_label = ModernLabel(
             tz_inner,
-            text=f"Current: {get_timezone_info()}",
+            text=f"Current: {get_timezone_info(self.backend)}",
             variant="secondary"
         )
         self.current_tz_label.pack(anchor="w", pady=(0, 12))
@@ -938,10 +807,11 @@ class MainApp(ctk.CTkFrame):
         tz_input_frame = ctk.CTkFrame(tz_inner, fg_color="transparent")
         tz_input_frame.pack(fill="x")
         
-        timezones = get_available_timezones()
+        self.timezone_index = TimezoneIndex(get_timezone_catalog(self.backend))
+        self.timezone_matches = [r.id for r in self.timezone_index.search("", TIMEZONE_DROPDOWN_LIMIT)]
         self.timezone_combo = ctk.CTkComboBox(
             tz_input_frame,
-            values=timezones,
+            values=self.timezone_matches,
             width=300,
             fg_color=COLORS["bg_input"],
             border_color=COLORS["border"],
@@ -952,7 +822,8 @@ class MainApp(ctk.CTkFrame):
             text_color=COLORS["text_primary"]
         )
         self.timezone_combo.pack(side="left", padx=(0, 12))
-        self.timezone_combo.set(get_timezone_info())
+        self.timezone_combo.set(get_timezone_info(self.backend))
+        self.timezone_combo.bind("<KeyRelease>", self.filter_timezones, add=True)
         
         ModernButton(
             tz_input_frame,
@@ -961,6 +832,13 @@ class MainApp(ctk.CTkFrame):
             variant="secondary"
         ).pack(side="left")
         
+        self.tz_match_label = ModernLabel(
+            tz_inner,
+            text=f"{len(self.timezone_index)} timezones - type to filter by name, city or offset",
+            variant="muted"
+        )
+        self.tz_match_label.pack(anchor="w", pady=(8, 0))
+        
         self.tz_status = ModernLabel(tz_inner, text="", variant="muted")
         self.tz_status.pack(anchor="w", pady=(12, 0))
     
@@ -985,16 +863,13 @@ class MainApp(ctk.CTkFrame):
         net_title.pack(anchor="w", pady=(0, 16))
         
         # Get network info
-        hostname = socket.gethostname()
-        try:
-            local_ip = socket.gethostbyname(hostname)
-        except:
-            local_ip = "Unknown"
+        hostname = get_computer_name(self.backend)
+        local_ip = get_local_ip(self.backend)
         
         info_items = [
             ("Hostname", hostname),
             ("Local IP", local_ip),
-            ("Timezone", get_timezone_info()),
+            ("Timezone", get_timezone_info(self.backend)),
         ]
         
         for label, value in info_items:
@@ -1022,13 +897,14 @@ class MainApp(ctk.CTkFrame):
         )
         mac_title.pack(side="left")
         
-        ModernButton(
+        self.reset_mac_btn = ModernButton(
             mac_title_frame,
             text="↺ Reset MAC",
             command=self.reset_mac,
             variant="ghost",
             width=100
-        ).pack(side="right")
+        )
+        self.reset_mac_btn.pack(side="right")
         
         # Adapter selection
         adapter_frame = ctk.CTkFrame(mac_inner, fg_color="transparent")
@@ -1036,7 +912,7 @@ class MainApp(ctk.CTkFrame):
         
         ModernLabel(adapter_frame, text="Network Adapter", variant="muted").pack(anchor="w")
         
-        adapters = get_network_adapters()
+        adapters = get_network_adapters(self.backend)
         adapter_names = [a['name'] for a in adapters] if adapters else ["No adapters found"]
         
         self.adapter_combo = ctk.CTkComboBox(
@@ -1061,7 +937,7 @@ class MainApp(ctk.CTkFrame):
         # Update current MAC display
         if adapters:
             self.adapter_combo.set(adapters[0]['name'])
-            self.current_mac_label.configure(text=f"Current MAC: {adapters[0]['mac']}")
+            self.update_label(self.current_mac_label, text=f"Current MAC: {adapters[0]['mac']}")
         
         # New MAC input
         new_mac_frame = ctk.CTkFrame(mac_inner, fg_color="transparent")
@@ -1083,13 +959,14 @@ class MainApp(ctk.CTkFrame):
             width=100
         ).pack(side="left", padx=(0, 12))
         
-        ModernButton(
+        self.apply_mac_btn = ModernButton(
             mac_input_row,
             text="Apply MAC",
             command=self.apply_mac,
             variant="primary",
             width=100
-        ).pack(side="left")
+        )
+        self.apply_mac_btn.pack(side="left")
         
         self.mac_status = ModernLabel(mac_inner, text="", variant="muted")
         self.mac_status.pack(anchor="w", pady=(8, 0))
@@ -1163,7 +1040,7 @@ class MainApp(ctk.CTkFrame):
         )
         admin_title.pack(anchor="w", pady=(0, 8))
         
-        if is_admin():
+        if self.ops.is_admin(self.backend):
             StatusIndicator(admin_inner, "Running with administrator privileges", "success").pack(anchor="w")
         else:
             StatusIndicator(admin_inner, "Running without administrator privileges", "warning").pack(anchor="w", pady=(0, 12))
@@ -1195,7 +1072,26 @@ class MainApp(ctk.CTkFrame):
             command=self.lock_app,
             variant="danger"
         ).pack(anchor="w")
+        
+        # Startup Timing Card
+        timing_card = Card(container)
+        timing_card.pack(fill="x", pady=(16, 0))
+        
+        timing_inner = ctk.CTkFrame(timing_card, fg_color="transparent")
+        timing_inner.pack(padx=24, pady=20, fill="x")
+        
+        timing_title = ctk.CTkLabel(
+            timing_inner,
+            text="Startup Timing",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLORS["text_primary"]
+        )
+        timing_title.pack(anchor="w", pady=(0, 8))
+        
+        self.timing_label = ModernLabel(timing_inner, text="", variant="muted", justify="left")
+        self.timing_label.pack(anchor="w")
     
+    @traced(kind="ui")
     def apply_offset(self, days=0, weeks=0):
         """Apply time offset to current entries"""
         try:
@@ -1215,12 +1111,113 @@ class MainApp(ctk.CTkFrame):
         except Exception as e:
             self.datetime_status.update_status(f"Error: {str(e)}", "error")
     
+    @traced(kind="ui")
+    def toggle_clock_rate(self):
+        """Start or stop running the clock at a custom rate"""
+        if self.rate_driver is not None:
+            self.rate_btn.configure(state="disabled")
+            self.rate_status.configure(text="Stopping - restoring real time...", text_color=COLORS["warning"])
+            self.executor.submit(self.rate_driver.stop, on_done=self.on_clock_rate_stopped)
+            return
+        
+        # The driver steps the clock from this process, so it needs local elevation
+        if not is_admin(self.backend):
+            self.rate_status.configure(text="Administrator privileges required!", text_color=COLORS["error"])
+            return
+        try:
+            max_step = self.rate_entries["max_step"].get().strip()
+            self.rate_driver = ClockRateDriver(
+                float(self.rate_entries["rate"].get()),
+                interval=float(self.rate_entries["interval"].get()),
+                max_step=float(max_step) if max_step else None,
+                backend=self.backend
+            )
+        except ValueError as e:
+            self.rate_status.configure(text=f"Invalid clock rate: {str(e)}", text_color=COLORS["error"])
+            return
+        
+        self.rate_driver.start()
+        self.rate_btn.configure(text="■ Stop")
+        if self.rate_status_after_id is None:
+            self.update_clock_rate_status()
+    
+    def on_clock_rate_stopped(self, stopped: bool):
+        self.rate_driver = None
+        self.rate_btn.configure(text="▶ Start", state="normal")
+        if stopped:
+            self.rate_status.configure(text="Stopped - clock back on real time", text_color=COLORS["text_muted"])
+        else:
+            self.rate_status.configure(text="Stopping - real time is restored after the last step",
+                                       text_color=COLORS["warning"])
+    
+    def update_clock_rate_status(self):
+        """Refresh the clock rate telemetry once a second while the driver runs and the app is shown"""
+        self.rate_status_after_id = None
+        if self.rate_driver is None or not self.running or self.paused:
+            return
+        t = self.rate_driver.telemetry()
+        lines = [
+            f"{t['rate']:g}× - {t['steps']} steps, step error mean {t['mean_error_ms']:.1f} ms / "
+            f"max {t['max_error_ms']:.1f} ms, CPU {t['cpu_percent']:.2f}%"
+        ]
+        if t["lag_s"] > 0:
+            lines.append(f"Behind the target rate by {t['lag_s']:.1f} s (max step reached)")
+        if t["failures"]:
+            lines.append(f"{t['failures']} failed steps: {t['last_error']}")
+        self.rate_status.configure(text="\n".join(lines), text_color=COLORS["text_secondary"])
+        self.rate_status_after_id = self.after(1000, self.update_clock_rate_status)
+    
+    def show_result(self, status_widget, result: tuple[bool, str]):
+        """Render an operation's (success, message) result in a status widget"""
+        success, message = result
+        if isinstance(status_widget, StatusIndicator):
+            status_widget.update_status(message, "success" if success else "error")
+        else:
+            color = COLORS["success"] if success else COLORS["error"]
+            self.update_label(status_widget, text=message, text_color=color)
+    
+    def update_label(self, label, **options):
+        """Configure a label through the UI dispatcher; only the latest pending update per label is applied"""
+        self.ui.post(label.configure, key=("label", id(label)), **options)
+    
+    def show_failure(self, status_widget, error: Exception):
+        """Render an unexpected exception raised by a background operation"""
+        self.show_result(status_widget, (False, f"Error: {str(error)}"))
+    
+    def run_operation(self, key: str, fn, *args, status_widget, busy_text: str, buttons=(), on_success=None):
+        """Submit an operation to the executor, disabling ``buttons`` (every control sharing ``key``) until it completes"""
+        if self.executor.busy(key):
+            return
+        
+        if isinstance(status_widget, StatusIndicator):
+            status_widget.update_status(busy_text, "warning")
+        else:
+            self.update_label(status_widget, text=busy_text, text_color=COLORS["warning"])
+        for button in buttons:
+            button.configure(state="disabled")
+        
+        def done(result):
+            for button in buttons:
+                button.configure(state="normal")
+            self.show_result(status_widget, result)
+            if result[0] and on_success:
+                on_success()
+        
+        def failed(error):
+            for button in buttons:
+                button.configure(state="normal")
+            self.show_failure(status_widget, error)
+        
+        self.executor.submit(fn, *args, self.backend, key=key, on_done=done, on_error=failed)
+    
+    @traced(kind="ui")
     def apply_datetime(self):
         """Apply the custom date and time"""
-        if not is_admin():
+        if not self.ops.is_admin(self.backend):
             self.datetime_status.update_status("Administrator privileges required!", "error")
             return
         
+        requested_at = time.monotonic()
         try:
             year = int(self.year_entry.get())
             month = int(self.month_entry.get())
@@ -1230,30 +1227,35 @@ class MainApp(ctk.CTkFrame):
             second = int(self.second_entry.get())
             
             # Validate
-            datetime(year, month, day, hour, minute, second)
-            
-            success, message = set_system_datetime(year, month, day, hour, minute, second)
-            
-            if success:
-                self.datetime_status.update_status(message, "success")
-            else:
-                self.datetime_status.update_status(message, "error")
-                
+            target = datetime(year, month, day, hour, minute, second)
         except ValueError as e:
             self.datetime_status.update_status(f"Invalid date/time: {str(e)}", "error")
+            return
+        
+        # The clock is set to the typed time plus the time elapsed since the click, then read back
+        tolerance = self.config.get("apply_tolerance_ms", APPLY_TOLERANCE_MS)
+        self.run_operation(
+            "datetime", self.ops.apply_system_datetime, target, requested_at, tolerance,
+            status_widget=self.datetime_status,
+            busy_text="Applying date & time...",
+            buttons=(self.apply_btn, self.restore_btn)
+        )
     
+    @traced(kind="ui")
     def restore_datetime(self):
         """Restore time sync with internet"""
-        if not is_admin():
+        if not self.ops.is_admin(self.backend):
             self.datetime_status.update_status("Administrator privileges required!", "error")
             return
         
-        success, message = restore_time_sync()
-        if success:
-            self.datetime_status.update_status(message, "success")
-        else:
-            self.datetime_status.update_status(message, "error")
+        self.run_operation(
+            "datetime", self.ops.restore_time_sync,
+            status_widget=self.datetime_status,
+            busy_text="Restoring time sync...",
+            buttons=(self.apply_btn, self.restore_btn)
+        )
     
+    @traced(kind="ui")
     def change_computer_name(self):
         """Change computer name"""
         new_name = self.computer_name_entry.get().strip()
@@ -1261,31 +1263,58 @@ class MainApp(ctk.CTkFrame):
             self.name_status.configure(text="Please enter a name", text_color=COLORS["error"])
             return
         
-        if not is_admin():
+        if not self.ops.is_admin(self.backend):
             self.name_status.configure(text="Administrator privileges required!", text_color=COLORS["error"])
             return
         
-        success, message = set_computer_name(new_name)
-        color = COLORS["success"] if success else COLORS["error"]
-        self.name_status.configure(text=message, text_color=color)
+        self.run_operation(
+            "computer_name", self.ops.set_computer_name, new_name,
+            status_widget=self.name_status,
+            busy_text="Changing computer name..."
+        )
     
+    def filter_timezones(self, event=None):
+        """Narrow the timezone dropdown to the entries matching the typed text"""
+        query = self.timezone_combo.get()
+        matches = self.timezone_index.search(query, TIMEZONE_DROPDOWN_LIMIT)
+        if self.timezone_index.get(query) is not None:
+            # A complete id was picked or typed - offer the full list again
+            matches = self.timezone_index.search("", TIMEZONE_DROPDOWN_LIMIT)
+            total = len(self.timezone_index)
+        else:
+            total = len(self.timezone_index.search(query))
+        
+        match_ids = [r.id for r in matches]
+        if match_ids != self.timezone_matches:
+            self.timezone_matches = match_ids
+            self.timezone_combo.configure(values=match_ids)
+        self.tz_match_label.configure(text=f"{total} of {len(self.timezone_index)} timezones match")
+    
+    @traced(kind="ui")
     def change_timezone(self):
         """Change timezone"""
-        timezone = self.timezone_combo.get()
-        if not timezone:
-            self.tz_status.configure(text="Please select a timezone", text_color=COLORS["error"])
+        text = self.timezone_combo.get().strip()
+        if not text:
+            self.update_label(self.tz_status, text="Please select a timezone", text_color=COLORS["error"])
             return
         
-        if not is_admin():
-            self.tz_status.configure(text="Administrator privileges required!", text_color=COLORS["error"])
+        record = self.timezone_index.resolve(text)
+        if record is None:
+            self.update_label(self.tz_status, text=f"Unknown or ambiguous timezone '{text}'", text_color=COLORS["error"])
             return
+        timezone = record.id
+        self.timezone_combo.set(timezone)
         
-        success, message = set_timezone(timezone)
-        color = COLORS["success"] if success else COLORS["error"]
-        self.tz_status.configure(text=message, text_color=color)
+        if not self.ops.is_admin(self.backend):
+            self.update_label(self.tz_status, text="Administrator privileges required!", text_color=COLORS["error"])
+            return
         
-        if success:
-            self.current_tz_label.configure(text=f"Current: {timezone}")
+        self.run_operation(
+            "timezone", self.ops.set_timezone, timezone,
+            status_widget=self.tz_status,
+            busy_text=f"Changing timezone to '{timezone}'...",
+            on_success=lambda: self.update_label(self.current_tz_label, text=f"Current: {timezone}")
+        )
     
     def open_calendar(self):
         """Open calendar picker dialog"""
@@ -1367,15 +1396,17 @@ class MainApp(ctk.CTkFrame):
     def reset_timezone(self):
         """Reset timezone to original"""
         self.timezone_combo.set(self.original_timezone)
-        self.tz_status.configure(text=f"Reset to: {self.original_timezone}", text_color=COLORS["text_muted"])
+        self.update_label(self.tz_status, text=f"Reset to: {self.original_timezone}", text_color=COLORS["text_muted"])
     
+    @traced(kind="ui")
     def on_adapter_select(self, adapter_name):
         """Handle adapter selection"""
-        adapters = get_network_adapters()
-        for adapter in adapters:
-            if adapter['name'] == adapter_name:
-                self.current_mac_label.configure(text=f"Current MAC: {adapter['mac']}")
-                break
+        def show_mac(inventory):
+            adapter = inventory.find(adapter_name)
+            if adapter is not None:
+                self.update_label(self.current_mac_label, text=f"Current MAC: {adapter.mac or 'N/A'}")
+        
+        self.executor.submit(get_adapter_inventory, self.backend, on_done=show_mac)
     
     def generate_random_mac(self):
         """Generate random MAC and fill entry"""
@@ -1383,88 +1414,128 @@ class MainApp(ctk.CTkFrame):
         self.mac_entry.delete(0, 'end')
         self.mac_entry.insert(0, mac)
     
+    @traced(kind="ui")
     def apply_mac(self):
         """Apply new MAC address"""
-        if not is_admin():
-            self.mac_status.configure(text="Administrator privileges required!", text_color=COLORS["error"])
+        if not self.ops.is_admin(self.backend):
+            self.update_label(self.mac_status, text="Administrator privileges required!", text_color=COLORS["error"])
             return
         
         adapter = self.adapter_combo.get()
         new_mac = self.mac_entry.get().strip()
         
         if not new_mac:
-            self.mac_status.configure(text="Please enter a MAC address", text_color=COLORS["error"])
+            self.update_label(self.mac_status, text="Please enter a MAC address", text_color=COLORS["error"])
             return
         
         # Validate MAC format
-        mac_pattern = re.compile(r'^([0-9A-Fa-f]{2}[-:]){5}[0-9A-Fa-f]{2}$|^[0-9A-Fa-f]{12}$')
-        if not mac_pattern.match(new_mac):
-            self.mac_status.configure(text="Invalid MAC format. Use XX-XX-XX-XX-XX-XX", text_color=COLORS["error"])
+        if not MAC_PATTERN.match(new_mac):
+            self.update_label(self.mac_status, text="Invalid MAC format. Use XX-XX-XX-XX-XX-XX", text_color=COLORS["error"])
             return
         
-        self.mac_status.configure(text="Applying MAC address...", text_color=COLORS["warning"])
-        self.update()
-        
-        success, message = set_mac_address(adapter, new_mac)
-        color = COLORS["success"] if success else COLORS["error"]
-        self.mac_status.configure(text=message, text_color=color)
-        
-        if success:
-            self.current_mac_label.configure(text=f"Current MAC: {new_mac}")
+        self.run_operation(
+            "mac", self.ops.set_mac_address, adapter, new_mac,
+            status_widget=self.mac_status,
+            busy_text="Applying MAC address...",
+            buttons=(self.apply_mac_btn, self.reset_mac_btn),
+            on_success=lambda: self.update_label(self.current_mac_label, text=f"Current MAC: {new_mac}")
+        )
     
+    @traced(kind="ui")
     def reset_mac(self):
         """Reset MAC address to original"""
-        if not is_admin():
-            self.mac_status.configure(text="Administrator privileges required!", text_color=COLORS["error"])
+        if not self.ops.is_admin(self.backend):
+            self.update_label(self.mac_status, text="Administrator privileges required!", text_color=COLORS["error"])
             return
         
         adapter = self.adapter_combo.get()
-        self.mac_status.configure(text="Resetting MAC address...", text_color=COLORS["warning"])
-        self.update()
-        
-        success, message = reset_mac_address(adapter)
-        color = COLORS["success"] if success else COLORS["error"]
-        self.mac_status.configure(text=message, text_color=color)
-        
-        if success:
-            # Refresh adapter info
-            self.after(2000, lambda: self.on_adapter_select(adapter))
+        self.run_operation(
+            "mac", self.ops.reset_mac_address, adapter,
+            status_widget=self.mac_status,
+            busy_text="Resetting MAC address...",
+            buttons=(self.apply_mac_btn, self.reset_mac_btn),
+            # Refresh adapter info (the interface is already back up)
+            on_success=lambda: self.on_adapter_select(adapter)
+        )
     
     def lock_app(self):
         """Lock the application"""
         self.master.show_login()
     
     def start_clock_update(self):
-        """Start updating the clock display"""
-        def update():
-            while self.running:
-                try:
-                    now = datetime.now()
-                    if self.current_time_label:
-                        self.current_time_label.configure(
-                            text=now.strftime("%H:%M:%S")
-                        )
-                    if self.current_date_label:
-                        self.current_date_label.configure(
-                            text=now.strftime("%A, %B %d, %Y")
-                        )
-                except:
-                    pass
-                time.sleep(1)
-        
-        self.clock_thread = threading.Thread(target=update, daemon=True)
-        self.clock_thread.start()
+        """Start the clock display ticker (one per MainApp)"""
+        if self.clock_after_id is None:
+            self.tick_clock()
+    
+    def tick_clock(self):
+        """Redraw whichever clock labels changed, then wake again just after the next second boundary"""
+        self.clock_after_id = None
+        if not self.running:
+            return
+        now = self.backend.now()
+        
+        time_text = now.strftime("%H:%M:%S")
+        if time_text != self.clock_time_text and self.current_time_label:
+            self.update_label(self.current_time_label, text=time_text)
+            self.clock_time_text = time_text
+        
+        # The date string only changes at midnight (or when the clock is moved)
+        day = now.date()
+        if day != self.clock_day and self.current_date_label:
+            self.update_label(self.current_date_label, text=now.strftime("%A, %B %d, %Y"))
+            self.clock_day = day
+        
+        delay_ms = 1000 - now.microsecond // 1000 + CLOCK_TICK_SLACK_MS
+        self.clock_after_id = self.after(delay_ms, self.tick_clock)
+    
+    def stop_clock_update(self):
+        """Cancel the pending clock tick"""
+        if self.clock_after_id is not None:
+            self.after_cancel(self.clock_after_id)
+            self.clock_after_id = None
+    
+    def pause(self):
+        """Hidden behind the lock screen: stop redrawing, keep state and running operations"""
+        if self.paused or not self.running:
+            return
+        self.paused = True
+        self.stop_clock_update()
+        self.ui.stop()
+        if self.rate_status_after_id is not None:
+            self.after_cancel(self.rate_status_after_id)
+            self.rate_status_after_id = None
+    
+    def resume(self):
+        """Shown again after unlocking: catch up on queued updates and restart the tickers"""
+        if not self.paused or not self.running:
+            return
+        self.paused = False
+        self.ui.start()
+        self.start_clock_update()
+        self.update_clock_rate_status()
+    
+    def record_unlock(self, elapsed_ms: float):
+        """Remember how long an unlock took until this view was drawn"""
+        self.unlock_ms.append(elapsed_ms)
+        self.update_timing_report()
     
     def stop(self):
-        """Stop the clock update thread"""
+        """Stop the clock ticker, the clock rate driver and background operations"""
         self.running = False
+        self.stop_clock_update()
+        self.ui.discard()
+        if self.rate_driver is not None:
+            self.rate_driver.stop()
+            self.rate_driver = None
+        self.executor.shutdown()
 
 # ==================== APPLICATION WINDOW ====================
 
 class ClockerApp(ctk.CTk):
     """Main application window"""
-    def __init__(self):
+    def __init__(self, backend: Optional[SystemBackend] = None):
         super().__init__()
+        self.backend = backend or get_backend()
         
         # Configure window
         self.title(APP_NAME)
@@ -1484,34 +1555,54 @@ class ClockerApp(ctk.CTk):
         except:
             pass
         
+        # Probe the system while the user is typing the password
+        prefetch_probes(self.backend)
+        
+        # Route changes through a running daemon (already elevated) when there is one
+        self.ops = find_daemon() or system
+        
         self.current_view = None
+        self.main_view = None
         self.show_login()
         
         # Handle close
         self.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def show_login(self):
-        """Show login screen"""
+        """Show login screen, hiding (not destroying) the main view"""
         if self.current_view:
-            if hasattr(self.current_view, 'stop'):
-                self.current_view.stop()
-            self.current_view.destroy()
+            if self.current_view is self.main_view:
+                self.main_view.pause()
+                self.main_view.pack_forget()
+            else:
+                self.current_view.destroy()
         
         self.current_view = LoginScreen(self, self.show_main)
         self.current_view.pack(fill="both", expand=True)
     
+    @traced(kind="ui")
     def show_main(self):
-        """Show main application"""
+        """Show main application, building it on the first unlock only"""
+        start = time.perf_counter()
         if self.current_view:
             self.current_view.destroy()
         
-        self.current_view = MainApp(self)
+        if self.main_view is None:
+            self.main_view = MainApp(self, self.backend, self.ops)
+        else:
+            self.main_view.resume()
+        self.current_view = self.main_view
         self.current_view.pack(fill="both", expand=True)
+        
+        # Unlock latency runs until the view has been laid out and drawn
+        view = self.main_view
+        self.update_idletasks()
+        view.record_unlock((time.perf_counter() - start) * 1000)
     
     def on_close(self):
         """Handle window close"""
-        if self.current_view and hasattr(self.current_view, 'stop'):
-            self.current_view.stop()
+        if self.main_view is not None:
+            self.main_view.stop()
         self.destroy()
 
 # ==================== ENTRY POINT ====================
@@ -1525,6 +1616,3 @@ def main():
     
     app = ClockerApp()
     app.mainloop()
-
-if __name__ == "__main__":
-    main()
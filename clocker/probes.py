@@ -0,0 +1,105 @@
+"""
+Probe cache - TTL cache in front of the read-only system getters
+(timezone, timezone list, adapters, hostname, local IP)
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+# Seconds each probe result stays fresh; writes invalidate explicitly
+PROBE_TTLS = {
+    "timezone": 300.0,
+    "timezones": 3600.0,
+    "adapters": 30.0,
+    "computer_name": 600.0,
+    "local_ip": 600.0,
+}
+
+class ProbeCache:
+    """Thread-safe TTL cache for probe results with per-probe hit/miss counters
+
+    Loads are single-flight: a caller asking for a probe that is already being
+    loaded (e.g. by the startup prefetcher) waits for that load instead of
+    spawning the same command again.
+    """
+
+    def __init__(self, ttls: Optional[dict] = None, default_ttl: float = 60.0, clock: Callable = time.monotonic):
+        self.ttls = dict(PROBE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.hits = {}
+        self.misses = {}
+        self._entries = {}
+        self._loading = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, name: str):
+        entry = self._entries.get(name)
+        if entry is not None and self.clock() - entry[1] < self.ttls.get(name, self.default_ttl):
+            return entry
+        return None
+
+    def get(self, name: str, loader: Callable):
+        """Cached value of ``name``, calling ``loader()`` on a miss or expiry
+
+        Exceptions from the loader propagate and nothing is cached.
+        """
+        with self._lock:
+            entry = self._fresh(name)
+            if entry is not None:
+                self.hits[name] = self.hits.get(name, 0) + 1
+                return entry[0]
+            pending = self._loading.get(name)
+            joining = pending is not None
+            if joining:
+                # Joining a load already in flight costs no extra probe
+                self.hits[name] = self.hits.get(name, 0) + 1
+            else:
+                self.misses[name] = self.misses.get(name, 0) + 1
+                pending = self._loading[name] = Future()
+                generation = self._generations.get(name, 0)
+        if joining:
+            return pending.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(name, None)
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._loading.pop(name, None)
+            # An invalidation during the load means the value may predate a write
+            if self._generations.get(name, 0) == generation:
+                self._entries[name] = (value, self.clock())
+        pending.set_result(value)
+        return value
+
+    def put(self, name: str, value):
+        """Store a freshly probed value"""
+        with self._lock:
+            self._entries[name] = (value, self.clock())
+
+    def invalidate(self, *names: str):
+        """Drop the given entries (all entries when no names are given)"""
+        with self._lock:
+            for name in names or list(set(self._entries) | set(self._loading)):
+                self._entries.pop(name, None)
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters and entry ages per probe"""
+        with self._lock:
+            now = self.clock()
+            return {
+                name: {
+                    "hits": self.hits.get(name, 0),
+                    "misses": self.misses.get(name, 0),
+                    "age": now - self._entries[name][1] if name in self._entries else None,
+                }
+                for name in sorted(set(self.hits) | set(self.misses) | set(self._entries))
+            }
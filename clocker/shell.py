@@ -0,0 +1,297 @@
+"""
+Shell sessions - long-lived cmd / PowerShell / sh processes that run commands
+fed over stdin, so each command skips interpreter startup
+
+Output is framed with a per-session sentinel line written after every
+command (with the exit code on stdout). A session that times out or breaks
+is killed and replaced by a fresh one on the next command.
+"""
+
+import os
+import queue
+import secrets
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+class ShellError(OSError):
+    """The shell session died or could not be started"""
+
+class UnsafeCommand(ShellError):
+    """The arguments cannot be passed through the shell verbatim (run the program directly instead)"""
+
+class Dialect:
+    """How to start a shell and frame one command for it"""
+    name = "sh"
+    argv = ["/bin/sh"]
+    # Characters the shell would still interpret after quoting, or that would break the framing
+    # (shlex quoting covers everything for sh)
+    unsafe = ""
+
+    def check(self, args: list):
+        """Raise UnsafeCommand if any argument contains a character in ``unsafe``"""
+        for arg in args:
+            if any(c in arg for c in self.unsafe):
+                raise UnsafeCommand(f"Argument {arg!r} cannot be passed safely through {self.name}")
+
+    def quote(self, args: list) -> str:
+        self.check(args)
+        return shlex.join(args)
+
+    def frame(self, command: str, sentinel: str) -> str:
+        # stdin is the command channel, so commands get /dev/null instead.
+        # The leading newline puts the sentinel on its own line even when the
+        # output has no trailing newline; the reader strips it again
+        return (f"{command} </dev/null\n"
+                f"__rc=$?; printf '\\n{sentinel} %d\\n' $__rc; printf '\\n{sentinel}\\n' >&2\n")
+
+class CmdDialect(Dialect):
+    name = "cmd"
+    argv = ["cmd.exe", "/Q", "/D", "/K", "prompt $"]
+    # list2cmdline is MSVCRT argv quoting: cmd still acts on these (and %VAR% expands) even in quotes
+    unsafe = '&|<>^%!"\r\n'
+
+    def quote(self, args: list) -> str:
+        self.check(args)
+        return subprocess.list2cmdline(args)
+
+    def frame(self, command: str, sentinel: str) -> str:
+        # One line per statement so %errorlevel% is expanded after the command ran
+        return (f"{command} <NUL\r\n"
+                f"echo.\r\n"
+                f"echo {sentinel} %errorlevel%\r\n"
+                f"(echo. & echo {sentinel}) 1>&2\r\n")
+
+class PowerShellDialect(Dialect):
+    name = "powershell"
+    argv = ["powershell.exe", "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", "-"]
+    # Braces and comments would escape the try block or swallow the sentinel; a backtick continues the line
+    unsafe = "{}#`\r\n"
+
+    def quote(self, args: list) -> str:
+        # Arguments after -Command are script text; powershell.exe itself joins them with spaces
+        self.check(args)
+        return " ".join(args)
+
+    def frame(self, command: str, sentinel: str) -> str:
+        # -Command - runs each stdin line as it arrives, so the command is wrapped onto one line
+        return (f"$global:LASTEXITCODE = 0; try {{ {command} }} catch {{ [Console]::Error.WriteLine($_); $global:LASTEXITCODE = 1 }}; "
+                f"[Console]::Out.Write(\"`n{sentinel} $LASTEXITCODE`n\"); [Console]::Error.Write(\"`n{sentinel}`n\")\r\n")
+
+DIALECTS = {d.name: d for d in (Dialect(), CmdDialect(), PowerShellDialect())}
+
+class ShellSession:
+    """One long-lived shell process running one command at a time"""
+
+    def __init__(self, dialect: Dialect, creationflags: int = 0):
+        self.dialect = dialect
+        self.sentinel = f"__CLOCKER_{secrets.token_hex(8)}__"
+        self.commands = 0
+        self._process = subprocess.Popen(
+            dialect.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            creationflags=creationflags,
+        )
+        self._stdout = queue.SimpleQueue()
+        self._stderr = queue.SimpleQueue()
+        for stream, lines in ((self._process.stdout, self._stdout), (self._process.stderr, self._stderr)):
+            threading.Thread(target=self._pump, args=(stream, lines), daemon=True,
+                             name=f"clocker-shell-{dialect.name}").start()
+
+    @staticmethod
+    def _pump(stream, lines):
+        for line in iter(stream.readline, ""):
+            lines.put(line)
+        lines.put(None)  # EOF
+
+    @property
+    def alive(self) -> bool:
+        return self._process.poll() is None
+
+    def _read_frame(self, lines, deadline: Optional[float]) -> tuple:
+        """Lines up to the sentinel; returns (text, sentinel line)"""
+        collected = []
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired(self.dialect.argv, 0)
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(self.dialect.argv, 0)
+            if line is None:
+                raise ShellError(f"{self.dialect.name} session exited (code {self._process.poll()})")
+            if line.startswith(self.sentinel):
+                text = "".join(collected)
+                return (text[:-1] if text.endswith("\n") else text), line
+            collected.append(line)
+
+    def run(self, args: list, timeout: Optional[float] = None,
+            command: Optional[str] = None) -> subprocess.CompletedProcess:
+        """Run one command; raises TimeoutExpired / ShellError (the session is then unusable)"""
+        if command is None:
+            command = self.dialect.quote(args)
+        try:
+            self._process.stdin.write(self.dialect.frame(command, self.sentinel))
+            self._process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise ShellError(f"{self.dialect.name} session is not accepting input: {str(e)}")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            stdout, marker = self._read_frame(self._stdout, deadline)
+            stderr, _ = self._read_frame(self._stderr, deadline)
+        except subprocess.TimeoutExpired:
+            raise subprocess.TimeoutExpired(args, timeout)
+        self.commands += 1
+        try:
+            returncode = int(marker[len(self.sentinel):].strip() or 0)
+        except ValueError:
+            returncode = 1
+        return subprocess.CompletedProcess(args, returncode, stdout.replace("\r\n", "\n"), stderr.replace("\r\n", "\n"))
+
+    def close(self):
+        """Kill the shell process"""
+        try:
+            self._process.kill()
+        except OSError:
+            pass
+        for stream in (self._process.stdin, self._process.stdout, self._process.stderr):
+            try:
+                stream.close()
+            except (OSError, ValueError):
+                pass
+        try:
+            self._process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+class ShellPool:
+    """Idle shell sessions per dialect, handed out one command at a time
+
+    Concurrent callers (e.g. parallel adapter bounces) each get their own
+    session, up to ``max_sessions`` per dialect; beyond that they wait, or
+    with ``overflow`` get a ShellError at once so they can spawn directly.
+    """
+
+    def __init__(self, max_sessions: int = 4, creationflags: int = 0, overflow: bool = False):
+        self.max_sessions = max_sessions
+        self.creationflags = creationflags
+        self.overflow = overflow
+        self.starts = 0
+        self.recycles = 0
+        self.commands = 0
+        self._idle = {}
+        self._open = {}
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _acquire(self, dialect: Dialect) -> ShellSession:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ShellError("Shell pool is closed")
+                idle = self._idle.setdefault(dialect.name, [])
+                while idle:
+                    session = idle.pop()
+                    if session.alive:
+                        return session
+                    self._discard(session)
+                if self._open.get(dialect.name, 0) < self.max_sessions:
+                    self._open[dialect.name] = self._open.get(dialect.name, 0) + 1
+                    break
+                if self.overflow:
+                    raise ShellError(f"All {self.max_sessions} {dialect.name} sessions are busy")
+                self._cond.wait()
+        try:
+            session = ShellSession(dialect, self.creationflags)
+        except OSError as e:
+            with self._cond:
+                self._open[dialect.name] -= 1
+                self._cond.notify()
+            raise ShellError(f"Could not start {dialect.name}: {str(e)}")
+        with self._cond:
+            self.starts += 1
+        return session
+
+    def _discard(self, session: ShellSession):
+        # Caller holds self._cond
+        self._open[session.dialect.name] -= 1
+        self.recycles += 1
+        self._cond.notify()
+
+    def _release(self, session: ShellSession, healthy: bool):
+        if not healthy:
+            session.close()
+        with self._cond:
+            if healthy and not self._closed:
+                self._idle[session.dialect.name].append(session)
+            else:
+                self._discard(session)
+                if healthy:
+                    session.close()
+            self._cond.notify()
+
+    def run(self, dialect_name: str, args: list, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """Run ``args`` in a session of the given dialect, recycling the session on error or timeout
+
+        Raises UnsafeCommand, before taking a session, if the arguments cannot be passed verbatim.
+        """
+        dialect = DIALECTS[dialect_name]
+        command = dialect.quote(args)
+        for attempt in range(2):
+            session = self._acquire(dialect)
+            fresh = session.commands == 0
+            try:
+                result = session.run(args, timeout, command)
+            except ShellError:
+                self._release(session, healthy=False)
+                if fresh or attempt:
+                    raise
+                continue  # A stale session died between commands - retry once on a new one
+            except BaseException:
+                self._release(session, healthy=False)
+                raise
+            self._release(session, healthy=True)
+            with self._cond:
+                self.commands += 1
+            return result
+
+    def close(self):
+        """Kill every idle session; busy sessions are killed when released"""
+        with self._cond:
+            self._closed = True
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+            for session in sessions:
+                self._discard(session)
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"starts": self.starts, "recycles": self.recycles, "commands": self.commands,
+                    "open": dict(self._open)}
+
+def route(args: list) -> tuple:
+    """(dialect name, args to run in it) for a command line
+
+    ``cmd /c X`` and ``powershell -Command X`` run X directly in the matching
+    session; any other program runs through a cmd session on Windows and
+    an sh session elsewhere.
+    """
+    program = os.path.splitext(os.path.basename(args[0]))[0].lower() if args else ""
+    if program == "cmd" and len(args) > 2 and args[1].lower() == "/c":
+        return "cmd", args[2:]
+    if program in ("powershell", "pwsh"):
+        rest = [a for a in args[1:] if a.lower() not in ("-nologo", "-noprofile", "-noninteractive")]
+        if rest and rest[0].lower() in ("-command", "-c"):
+            return "powershell", rest[1:]
+    return ("cmd" if sys.platform == "win32" else "sh"), args
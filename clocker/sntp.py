@@ -0,0 +1,185 @@
+"""
+SNTP - a small in-process SNTP (RFC 4330) client used to put the clock back
+on real time, plus a local UDP server stand-in for testing it
+"""
+
+import socket
+import statistics
+import struct
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, NamedTuple
+
+NTP_PORT = 123
+NTP_EPOCH_DELTA = 2208988800  # Seconds from 1900-01-01 to 1970-01-01
+NTP_PACKET = struct.Struct("!BBbb11I")
+SNTP_TIMEOUT = 2.0
+
+# Once the first reply is in, stragglers get this long (or as long as it took, if longer)
+SNTP_GRACE = 0.05
+
+# Samples further than this from the median offset (or 3 scaled MADs, if larger) are outliers
+OUTLIER_FLOOR = 0.025
+
+class NTPSample(NamedTuple):
+    server: str
+    offset: float
+    delay: float
+    stratum: int
+
+def _to_ntp(timestamp: float) -> tuple:
+    seconds = timestamp + NTP_EPOCH_DELTA
+    whole = int(seconds)
+    return whole & 0xFFFFFFFF, int((seconds - whole) * 2**32) & 0xFFFFFFFF
+
+def _from_ntp(seconds: int, fraction: int) -> float:
+    return seconds - NTP_EPOCH_DELTA + fraction / 2**32
+
+def parse_server(server: str) -> tuple:
+    """(host, port) from ``host`` or ``host:port``"""
+    host, sep, port = server.rpartition(":")
+    if sep and port.isdigit():
+        return host, int(port)
+    return server, NTP_PORT
+
+def query_server(server: str, clock: Callable = time.time, timeout: float = SNTP_TIMEOUT) -> NTPSample:
+    """One SNTP exchange; ``clock`` is the local clock being measured (epoch seconds)
+
+    Raises OSError on network failures and ValueError on an unusable reply.
+    """
+    host, port = parse_server(server)
+    address = socket.getaddrinfo(host, port, 0, socket.SOCK_DGRAM)[0]
+    with socket.socket(address[0], socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        # Connected, so only the server's replies arrive and an unreachable port fails fast
+        sock.connect(address[4])
+        t1 = clock()
+        # t4 is derived from the monotonic clock so a wall clock change mid-query cannot skew it
+        sent = time.monotonic()
+        tx_seconds, tx_fraction = _to_ntp(t1)
+        request = NTP_PACKET.pack(0x23, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, tx_seconds, tx_fraction)  # v4, client
+        sock.send(request)
+        while True:
+            data = sock.recv(512)
+            if len(data) >= NTP_PACKET.size:
+                fields = NTP_PACKET.unpack(data[:NTP_PACKET.size])
+                if (fields[9], fields[10]) == (tx_seconds, tx_fraction):
+                    break  # Ignore stray or spoofed replies that do not echo our timestamp
+        t4 = t1 + (time.monotonic() - sent)
+
+    leap, mode, stratum = fields[0] >> 6, fields[0] & 0x7, fields[1]
+    if mode != 4:
+        raise ValueError(f"{server}: not a server reply (mode {mode})")
+    if leap == 3 or stratum == 0 or stratum > 15:
+        raise ValueError(f"{server}: server is unsynchronized (stratum {stratum})")
+    t2 = _from_ntp(fields[11], fields[12])
+    t3 = _from_ntp(fields[13], fields[14])
+    offset = ((t2 - t1) + (t3 - t4)) / 2
+    delay = (t4 - t1) - (t3 - t2)
+    return NTPSample(server, offset, max(delay, 0.0), stratum)
+
+def query_servers(servers: list, clock: Callable = time.time, timeout: float = SNTP_TIMEOUT) -> tuple:
+    """Query every server concurrently; returns (samples, {server: error})
+
+    Does not wait out unresponsive servers once another one has answered:
+    they get SNTP_GRACE past the first reply, so one dead server costs
+    little more than a round trip rather than the full timeout.
+    """
+    samples, errors = [], {}
+    if not servers:
+        return samples, errors
+    start = time.monotonic()
+    deadline = start + timeout
+    pool = ThreadPoolExecutor(max_workers=len(servers), thread_name_prefix="clocker-sntp")
+    futures = {pool.submit(query_server, server, clock, timeout): server for server in servers}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, max(0.0, deadline - time.monotonic()), FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                try:
+                    samples.append(future.result())
+                except (OSError, ValueError) as e:
+                    errors[futures[future]] = str(e) or type(e).__name__
+            if samples:
+                elapsed = time.monotonic() - start
+                deadline = min(deadline, start + elapsed + max(elapsed, SNTP_GRACE))
+    finally:
+        pool.shutdown(wait=False)
+    for future in pending:
+        errors[futures[future]] = "no reply"
+    return samples, errors
+
+def select_samples(samples: list) -> tuple:
+    """(best sample, inliers, outliers): outliers are far from the median offset,
+    the best inlier is the one with the shortest round trip"""
+    if not samples:
+        return None, [], []
+    if len(samples) < 3:
+        inliers, outliers = list(samples), []
+    else:
+        median = statistics.median(s.offset for s in samples)
+        mad = statistics.median(abs(s.offset - median) for s in samples)
+        limit = max(OUTLIER_FLOOR, 3 * 1.4826 * mad)
+        inliers = [s for s in samples if abs(s.offset - median) <= limit]
+        outliers = [s for s in samples if abs(s.offset - median) > limit]
+    return min(inliers, key=lambda s: s.delay), inliers, outliers
+
+# ==================== LOCAL STAND-IN ====================
+
+class LocalNTPServer:
+    """Minimal UDP NTP server on localhost whose reference clock is ``time.time() + offset``
+
+    ``delay`` adds a processing pause before each reply; ``stratum=0``
+    makes it answer like an unsynchronized server.
+    """
+
+    def __init__(self, offset: float = 0.0, delay: float = 0.0, stratum: int = 2, host: str = "127.0.0.1"):
+        self.offset = offset
+        self.delay = delay
+        self.stratum = stratum
+        self.requests = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((host, 0))
+        self._sock.settimeout(0.2)
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="clocker-ntp-standin", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self) -> str:
+        host, port = self._sock.getsockname()[:2]
+        return f"{host}:{port}"
+
+    def _serve(self):
+        while self._running:
+            try:
+                data, peer = self._sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if len(data) < NTP_PACKET.size:
+                continue
+            received = _to_ntp(time.time() + self.offset)
+            if self.delay:
+                time.sleep(self.delay)
+            request = NTP_PACKET.unpack(data[:NTP_PACKET.size])
+            transmitted = _to_ntp(time.time() + self.offset)
+            reply = NTP_PACKET.pack(
+                0x24, self.stratum, 6, -20, 0, 0, 0, 0, 0,
+                request[13], request[14], *received, *transmitted
+            )
+            self.requests += 1
+            try:
+                self._sock.sendto(reply, peer)
+            except OSError:
+                pass
+
+    def close(self):
+        self._running = False
+        self._sock.close()
+        self._thread.join(1)
@@ -0,0 +1,14 @@
+"""
+Stats - small helpers shared by the benchmarks, timelines, tracing and the UI
+metrics
+"""
+
+import math
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
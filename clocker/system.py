@@ -0,0 +1,698 @@
+"""
+System operations - date/time, timezone, computer name and MAC address changes
+"""
+
+import ctypes
+import functools
+import sys
+import os
+import threading
+import json
+import hashlib
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from . import APP_NAME
+from .backend import (
+    SystemBackend, get_backend,
+    COMPUTER_NAME_KEY, ACTIVE_COMPUTER_NAME_KEY,
+    CURRENT_VERSION_KEY, TIME_ZONES_KEY
+)
+from .adapters import Adapter, AdapterInventory, build_inventory, get_adapter_index, normalize_mac
+from .timezones import TimezoneRecord, parse_tzutil_list, load_catalog, save_catalog
+from .sntp import SNTP_TIMEOUT, query_servers, select_samples
+from .tracing import bind, traced
+
+# ==================== CONFIGURATION ====================
+
+PASSWORD_HASH = hashlib.sha256("kali2003".encode()).hexdigest()
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "clocker_config.json")
+
+def user_data_dir() -> str:
+    """Per-user directory for state files and caches
+
+    %LOCALAPPDATA%\\Clocker, beside the executable when frozen, else
+    $XDG_STATE_HOME/Clocker (~/.local/state/Clocker). Writers create it on
+    first use with 0700 permissions, since it holds the daemon token.
+    """
+    local_app_data = os.environ.get("LOCALAPPDATA")
+    if local_app_data:
+        return os.path.join(local_app_data, APP_NAME)
+    if getattr(sys, 'frozen', False):
+        # A onefile build unpacks into a temporary _MEIPASS dir that is deleted on exit
+        return os.path.dirname(sys.executable)
+    state_home = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(state_home, APP_NAME)
+
+DATA_DIR = user_data_dir()
+TIMEZONE_CACHE_FILE = os.path.join(DATA_DIR, "clocker_timezones.json")
+TIMEZONE_CACHE_MAX_AGE = 7 * 24 * 3600  # Re-check tzutil in the background after a week
+
+# Adapter bounce: poll getmac with exponential backoff until the link is back
+BOUNCE_DEADLINE = 15.0
+BOUNCE_POLL_INITIAL = 0.1
+BOUNCE_POLL_MAX = 1.0
+
+# Default read-back tolerance for the GUI's Apply, and how many corrective re-applies it may do
+APPLY_TOLERANCE_MS = 100.0
+APPLY_MAX_CORRECTIONS = 2
+
+# Largest error restore_time_sync accepts when re-measuring over SNTP (includes network asymmetry)
+RESTORE_TOLERANCE_MS = 100.0
+
+# Queried together by restore_time_sync; override with the ``ntp_servers`` config key or CLOCKER_NTP_SERVERS
+NTP_SERVERS = ("time.windows.com", "time.google.com", "time.cloudflare.com", "pool.ntp.org")
+
+MAC_PATTERN = re.compile(r'^([0-9A-Fa-f]{2}[-:]){5}[0-9A-Fa-f]{2}$|^[0-9A-Fa-f]{12}$')
+
+# ==================== UTILITY FUNCTIONS ====================
+
+def cached_probe(name: str, fallback):
+    """Serve a getter from the backend's probe cache; failures return ``fallback()`` uncached"""
+    def decorator(query):
+        traced_query = traced(name, "probe")(query)
+
+        @functools.wraps(query)
+        def probe(backend: Optional[SystemBackend] = None, fresh: bool = False):
+            backend = backend or get_backend()
+            try:
+                if fresh:
+                    value = traced_query(backend)
+                    backend.probe_cache.put(name, value)
+                    return value
+                return backend.probe_cache.get(name, lambda: traced_query(backend))
+            except Exception:
+                return fallback()
+        return probe
+    return decorator
+
+def is_admin(backend: Optional[SystemBackend] = None) -> bool:
+    """Check if running with administrator privileges"""
+    backend = backend or get_backend()
+    return backend.is_admin()
+
+def run_as_admin():
+    """Restart the script with admin privileges"""
+    if sys.platform == 'win32':
+        if getattr(sys, 'frozen', False):
+            params = " ".join(sys.argv[1:])
+        else:
+            params = " ".join(["-m", "clocker"] + sys.argv[1:])
+        ctypes.windll.shell32.ShellExecuteW(
+            None, "runas", sys.executable, params, None, 1
+        )
+        sys.exit()
+
+# Held while the Windows Time service is being switched on or off
+_time_service_lock = threading.Lock()
+
+# sc stop exit codes meaning the service is not running afterwards: stopped, not installed, not started
+SC_STOPPED_CODES = (0, 1060, 1062)
+SC_SERVICE_NOT_INSTALLED = 1060
+# sc start exit codes meaning the service is running afterwards: started, already running
+SC_RUNNING_CODES = (0, 1056)
+
+@traced()
+def disable_time_sync(backend: Optional[SystemBackend] = None, force: bool = False) -> tuple[bool, str]:
+    """Stop and unregister the Windows Time service so it cannot undo a clock change
+
+    Runs once per backend; later calls are no-ops until time sync is restored.
+    """
+    backend = backend or get_backend()
+    with _time_service_lock:
+        if backend.time_sync_disabled and not force:
+            return True, "Time sync already disabled"
+        try:
+            stop = backend.run(['sc', 'stop', 'w32time'])
+            if stop.returncode not in SC_STOPPED_CODES:
+                return False, f"Failed to stop Windows Time: {(stop.stderr or stop.stdout).strip()}"
+            # An uninstalled service has nothing left to unregister
+            if stop.returncode != SC_SERVICE_NOT_INSTALLED:
+                unregister = backend.run(['w32tm', '/unregister'])
+                if unregister.returncode != 0:
+                    return False, f"Failed to unregister Windows Time: {(unregister.stderr or unregister.stdout).strip()}"
+            backend.time_sync_disabled = True
+            return True, "Time sync disabled"
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+
+@traced()
+def set_system_datetime(year: int, month: int, day: int, hour: int, minute: int, second: float,
+                        backend: Optional[SystemBackend] = None, disable_sync: bool = True) -> tuple[bool, str]:
+    """Set the Windows system date and time (``second`` may be fractional)
+
+    ``disable_sync=False`` leaves the Windows Time service alone, for writes of the real time.
+    """
+    backend = backend or get_backend()
+    spawns_before = backend.spawn_count
+    start = time.perf_counter()
+    try:
+        whole_second = int(second)
+        microsecond = min(999999, round((second - whole_second) * 1e6))
+        target = datetime(year, month, day, hour, minute, whole_second, microsecond)
+
+        # Disable automatic time sync first (only the first apply spawns anything)
+        if disable_sync:
+            disabled, message = disable_time_sync(backend)
+            if not disabled:
+                return False, f"{message} - not changing the clock, Windows would revert it"
+
+        try:
+            backend.set_local_time(target)
+        except (OSError, NotImplementedError):
+            # Fall back to the shell when the native call is unavailable
+            date_result = backend.run(['cmd', '/c', 'date', f"{month:02d}-{day:02d}-{year}"])
+            time_result = backend.run(['cmd', '/c', 'time', f"{hour:02d}:{minute:02d}:{whole_second:02d}"])
+            if date_result.returncode != 0 or time_result.returncode != 0:
+                return False, f"Failed to set date/time: {(date_result.stderr or time_result.stderr).strip()}"
+
+        spawned = backend.spawn_count - spawns_before
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return True, f"Date and time changed successfully! ({spawned} processes, {elapsed_ms:.0f} ms)"
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+@traced()
+def apply_system_datetime(target: datetime, requested_at: Optional[float] = None,
+                          tolerance_ms: Optional[float] = None, backend: Optional[SystemBackend] = None,
+                          max_corrections: int = APPLY_MAX_CORRECTIONS, disable_sync: bool = True) -> tuple[bool, str]:
+    """Set the clock to ``target`` as of ``requested_at`` (a time.monotonic() stamp), then verify it
+
+    The time elapsed since the request is added before committing, and the
+    clock is read back afterwards. If the achieved error exceeds
+    ``tolerance_ms``, the apply is repeated with the error fed back as a
+    correction (at most ``max_corrections`` times).
+    """
+    backend = backend or get_backend()
+    if requested_at is None:
+        requested_at = time.monotonic()
+    if disable_sync:
+        # One-off setup: done before the first commit is stamped, so its cost is not mistaken for bias
+        disabled, message = disable_time_sync(backend)
+        if not disabled:
+            return False, f"{message} - not changing the clock, Windows would revert it"
+    correction = 0.0
+    corrections = 0
+    while True:
+        commit = target + timedelta(seconds=time.monotonic() - requested_at - correction)
+        success, message = set_system_datetime(
+            commit.year, commit.month, commit.day, commit.hour, commit.minute,
+            commit.second + commit.microsecond / 1e6, backend, disable_sync=False
+        )
+        if not success:
+            return success, message
+        try:
+            achieved = backend.now()
+            expected = target + timedelta(seconds=time.monotonic() - requested_at)
+        except Exception as e:
+            return True, f"{message} (read-back failed: {str(e)})"
+        error = (achieved - expected).total_seconds()
+
+        if tolerance_ms is None or abs(error) * 1000 <= tolerance_ms:
+            break
+        if corrections >= max_corrections:
+            return False, (f"Clock is off by {error * 1000:+.1f} ms after {corrections} corrections "
+                           f"(tolerance {tolerance_ms:g} ms)")
+        correction += error
+        corrections += 1
+
+    detail = f"achieved error {error * 1000:+.1f} ms"
+    if corrections:
+        detail += f" after {corrections} correction{'s' if corrections > 1 else ''}"
+    return True, f"{message} - {detail}"
+
+def ntp_servers() -> list:
+    """SNTP servers from CLOCKER_NTP_SERVERS (comma-separated), the config, or NTP_SERVERS"""
+    configured = os.environ.get("CLOCKER_NTP_SERVERS", "").strip()
+    if configured:
+        return [server.strip() for server in configured.split(",") if server.strip()]
+    return list(load_config().get("ntp_servers") or NTP_SERVERS)
+
+@traced()
+def enable_time_sync(backend: Optional[SystemBackend] = None, resync: bool = True) -> tuple[bool, str]:
+    """Register and start the Windows Time service (and ask it to resync)"""
+    backend = backend or get_backend()
+    with _time_service_lock:
+        try:
+            register = backend.run(['w32tm', '/register'])
+            if register.returncode != 0:
+                return False, f"Failed to register Windows Time: {(register.stderr or register.stdout).strip()}"
+            start = backend.run(['sc', 'start', 'w32time'])
+            if start.returncode not in SC_RUNNING_CODES:
+                return False, f"Failed to start Windows Time: {(start.stderr or start.stdout).strip()}"
+            backend.time_sync_disabled = False
+            if resync:
+                resync_result = backend.run(['w32tm', '/resync', '/nowait'])
+                if resync_result.returncode != 0:
+                    return False, f"Failed to resync Windows Time: {(resync_result.stderr or resync_result.stdout).strip()}"
+            return True, "Time sync restored successfully!"
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+
+@traced()
+def restore_time_sync(backend: Optional[SystemBackend] = None, servers: Optional[list] = None,
+                      tolerance_ms: float = RESTORE_TOLERANCE_MS) -> tuple[bool, str]:
+    """Put the clock back on real time over SNTP, then re-enable Windows time sync
+
+    All servers are queried at once and outliers are dropped, so the
+    correction costs about one round trip. The result is checked with a
+    second query and fails if the residual error exceeds ``tolerance_ms``.
+    Falls back to ``w32tm /resync`` when no server answers.
+    """
+    backend = backend or get_backend()
+    start = time.perf_counter()
+    try:
+        servers = list(servers) if servers else ntp_servers()
+        clock = lambda: backend.now().timestamp()
+        samples, errors = query_servers(servers, clock)
+        best, inliers, outliers = select_samples(samples)
+        if best is None:
+            success, message = enable_time_sync(backend)
+            return success, f"{message} (no SNTP server answered, resynced via w32tm)" if success else message
+
+        # The real time is written, so the service does not need stopping first
+        requested_at = time.monotonic()
+        target = backend.now() + timedelta(seconds=best.offset)
+        success, message = apply_system_datetime(target, requested_at, tolerance_ms, backend, disable_sync=False)
+        if not success:
+            return success, message
+
+        # Re-measure against the inliers only; that is the residual error
+        check, _ = query_servers([s.server for s in inliers], clock, SNTP_TIMEOUT)
+        verified, _, _ = select_samples(check)
+
+        # The clock is already right, so the service is brought back without a resync
+        enabled, message = enable_time_sync(backend, resync=False)
+        if not enabled:
+            return False, f"Clock corrected by {best.offset:+.3f} s, but time sync was not re-enabled: {message}"
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        detail = (f"corrected by {best.offset:+.3f} s via {best.server} "
+                  f"(delay {best.delay * 1000:.0f} ms, {len(inliers)}/{len(servers)} servers agreed")
+        if outliers:
+            detail += f", {len(outliers)} outlier{'s' if len(outliers) > 1 else ''} dropped"
+        detail += f") in {elapsed_ms:.0f} ms"
+        if verified is None:
+            return True, f"Clock {detail}; could not re-check the result"
+        residual_ms = verified.offset * 1000
+        if abs(residual_ms) > tolerance_ms:
+            return False, f"Clock {detail}, but is still off by {residual_ms:+.1f} ms"
+        return True, f"Clock {detail}; residual error {residual_ms:+.1f} ms"
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+@cached_probe("computer_name", lambda: "Unknown")
+def get_computer_name(backend: SystemBackend) -> str:
+    """Get current computer name"""
+    return backend.computer_name()
+
+@cached_probe("local_ip", lambda: "Unknown")
+def get_local_ip(backend: SystemBackend) -> str:
+    """Resolve the local IP address of this computer"""
+    return backend.resolve_host(backend.computer_name())
+
+@traced()
+def set_computer_name(new_name: str, backend: Optional[SystemBackend] = None) -> tuple[bool, str]:
+    """Change computer name (requires restart)"""
+    backend = backend or get_backend()
+    try:
+        backend.reg_set(COMPUTER_NAME_KEY, "ComputerName", new_name)
+        backend.reg_set(ACTIVE_COMPUTER_NAME_KEY, "ComputerName", new_name)
+        backend.probe_cache.invalidate("computer_name", "local_ip")
+
+        return True, f"Computer name changed to '{new_name}'. Restart required."
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+@cached_probe("timezone", lambda: "Unknown")
+def get_timezone_info(backend: SystemBackend) -> str:
+    """Get current timezone"""
+    result = backend.run(['tzutil', '/g'])
+    if result.returncode != 0:
+        raise OSError(result.returncode, result.stderr.strip())
+    return result.stdout.strip()
+
+FALLBACK_TIMEZONES = [
+    TimezoneRecord("Pacific Standard Time", "(UTC-08:00) Pacific Time (US & Canada)", -480),
+    TimezoneRecord("Central Standard Time", "(UTC-06:00) Central Time (US & Canada)", -360),
+    TimezoneRecord("Eastern Standard Time", "(UTC-05:00) Eastern Time (US & Canada)", -300),
+    TimezoneRecord("UTC", "(UTC) Coordinated Universal Time", 0),
+]
+
+_catalog_refreshing = threading.Lock()
+
+def timezone_catalog_key(backend: SystemBackend) -> str:
+    """Cache key for the timezone catalog: backend, OS build and tz database version"""
+    try:
+        version = backend.reg_values(CURRENT_VERSION_KEY, ["CurrentBuild", "UBR"])
+        build = f"{version.get('CurrentBuild', '?')}.{version.get('UBR', 0)}"
+    except OSError:
+        build = "unknown"
+    try:
+        tz_version = backend.reg_values(TIME_ZONES_KEY, ["TzVersion"]).get("TzVersion", 0)
+    except OSError:
+        tz_version = 0
+    return f"{backend.name}/{build}/tz{tz_version}"
+
+def _query_timezone_catalog(backend: SystemBackend) -> list:
+    result = backend.run(['tzutil', '/l'])
+    if result.returncode != 0:
+        raise OSError(result.returncode, result.stderr.strip())
+    records = parse_tzutil_list(result.stdout)
+    if not records:
+        raise ValueError("tzutil /l returned no timezones")
+    return records
+
+def refresh_timezone_catalog(backend: SystemBackend, key: str, cache_file: Optional[str] = None) -> list:
+    """Re-run tzutil /l and rewrite the on-disk catalog cache"""
+    records = _query_timezone_catalog(backend)
+    try:
+        save_catalog(cache_file or TIMEZONE_CACHE_FILE, key, records)
+    except OSError:
+        pass
+    return records
+
+def _refresh_in_background(backend: SystemBackend, key: str):
+    """Refresh a stale on-disk catalog without blocking the caller (one refresh at a time)"""
+    if not _catalog_refreshing.acquire(blocking=False):
+        return
+
+    def refresh():
+        try:
+            backend.probe_cache.put("timezones", refresh_timezone_catalog(backend, key))
+        except Exception:
+            pass
+        finally:
+            _catalog_refreshing.release()
+
+    threading.Thread(target=refresh, name="clocker-tz-refresh", daemon=True).start()
+
+@cached_probe("timezones", lambda: list(FALLBACK_TIMEZONES))
+def get_timezone_catalog(backend: SystemBackend) -> list:
+    """Get the full timezone catalog as id/display-name/UTC-offset records
+
+    Served from the on-disk cache when it matches the current OS build and
+    tz database version; a stale cache is returned and refreshed in the background.
+    """
+    key = timezone_catalog_key(backend)
+    cached = load_catalog(TIMEZONE_CACHE_FILE, key)
+    if cached is None:
+        return refresh_timezone_catalog(backend, key)
+
+    records, saved = cached
+    if time.time() - saved > TIMEZONE_CACHE_MAX_AGE:
+        _refresh_in_background(backend, key)
+    return records
+
+def get_available_timezones(backend: Optional[SystemBackend] = None) -> list:
+    """Get list of available timezone ids"""
+    return [record.id for record in get_timezone_catalog(backend)]
+
+@traced()
+def set_timezone(timezone: str, backend: Optional[SystemBackend] = None) -> tuple[bool, str]:
+    """Set system timezone"""
+    backend = backend or get_backend()
+    try:
+        result = backend.run(['tzutil', '/s', timezone])
+        if result.returncode == 0:
+            backend.probe_cache.invalidate("timezone")
+            return True, f"Timezone changed to '{timezone}'"
+        return False, f"Failed to change timezone: {result.stderr}"
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+@cached_probe("adapters", lambda: AdapterInventory([]))
+def get_adapter_inventory(backend: SystemBackend) -> AdapterInventory:
+    """Get the network adapters from getmac joined to their registry keys"""
+    result = backend.run(['getmac', '/v', '/fo', 'csv'])
+    if result.returncode != 0:
+        raise OSError(result.returncode, result.stderr.strip())
+    return build_inventory(result.stdout, get_adapter_index(backend))
+
+def get_network_adapters(backend: Optional[SystemBackend] = None) -> list:
+    """Get list of network adapters with their MAC addresses"""
+    return [
+        {
+            'name': adapter.name,
+            'description': adapter.description,
+            'mac': adapter.mac,
+            'guid': adapter.guid
+        }
+        for adapter in get_adapter_inventory(backend)
+        if adapter.mac
+    ]
+
+# Everything MainApp probes while it is being built
+STARTUP_PROBES = (
+    get_timezone_info,
+    get_timezone_catalog,
+    get_adapter_inventory,
+    get_computer_name,
+    get_local_ip,
+)
+
+def prefetch_probes(backend: Optional[SystemBackend] = None) -> list:
+    """Warm the probe cache by running every startup probe concurrently in the background"""
+    backend = backend or get_backend()
+    threads = []
+    for probe in STARTUP_PROBES:
+        thread = threading.Thread(
+            target=probe, args=(backend,),
+            name=f"clocker-prefetch-{probe.__name__}", daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
+
+def generate_random_mac() -> str:
+    """Generate a random MAC address"""
+    mac = [0x00, 0x16, 0x3e,
+           random.randint(0x00, 0x7f),
+           random.randint(0x00, 0xff),
+           random.randint(0x00, 0xff)]
+    return '-'.join(map(lambda x: "%02X" % x, mac))
+
+class BounceResult(NamedTuple):
+    ok: bool
+    latency: float
+    mac: str
+    polls: int
+    error: str = ""  # Set when netsh could not bounce the interface
+
+@traced()
+def bounce_adapters(targets: dict, backend: Optional[SystemBackend] = None,
+                    deadline: float = BOUNCE_DEADLINE) -> dict:
+    """Bounce several interfaces concurrently and wait until each is back up
+
+    ``targets`` maps connection name to the MAC it should come back with
+    (None for any). All interfaces are disabled/re-enabled in parallel, then a
+    single getmac poll per round checks every adapter still pending, with
+    exponential backoff until ``deadline``. An adapter counts as back once
+    getmac shows it enabled with the expected MAC; it need not have a link.
+    Interfaces netsh fails to disable or enable are not polled and come back
+    with ``error`` set. Returns name -> BounceResult.
+    """
+    backend = backend or get_backend()
+    expected = {name: normalize_mac(mac) if mac else None for name, mac in targets.items()}
+    start = time.monotonic()
+
+    def restart(name) -> str:
+        """Empty on success, else netsh's error"""
+        for action in ('disable', 'enable'):
+            result = backend.run(['netsh', 'interface', 'set', 'interface', name, action])
+            if result.returncode != 0:
+                return f"netsh {action} failed: {(result.stderr or result.stdout).strip()}"
+        return ""
+
+    if len(targets) == 1:
+        errors = [restart(next(iter(targets)))]
+    else:
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="clocker-bounce") as pool:
+            errors = list(pool.map(bind(restart), targets))
+
+    # Interfaces netsh could not bounce are not polled for
+    results = {name: BounceResult(False, time.monotonic() - start, "", 0, error)
+               for name, error in zip(targets, errors) if error}
+    if len(results) == len(targets):
+        return results
+    last_mac = {name: "" for name in targets}
+    delay = BOUNCE_POLL_INITIAL
+    polls = 0
+    while True:
+        polls += 1
+        inventory = get_adapter_inventory(backend, fresh=True)
+        for name in targets:
+            if name in results:
+                continue
+            adapter = inventory.find(name)
+            if adapter is None:
+                continue
+            last_mac[name] = adapter.mac
+            if adapter.enabled and (expected[name] is None or normalize_mac(adapter.mac) == expected[name]):
+                results[name] = BounceResult(True, time.monotonic() - start, adapter.mac, polls)
+        if len(results) == len(targets):
+            return results
+        remaining = deadline - (time.monotonic() - start)
+        if remaining <= 0:
+            for name in targets:
+                results.setdefault(name, BounceResult(False, time.monotonic() - start, last_mac[name], polls))
+            return results
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, BOUNCE_POLL_MAX)
+
+def bounce_adapter(adapter_name: str, expected_mac: Optional[str] = None,
+                   backend: Optional[SystemBackend] = None, deadline: float = BOUNCE_DEADLINE) -> BounceResult:
+    """Disable and re-enable a network interface, then poll until it is back up
+
+    Returns as soon as getmac reports the adapter enabled (and with
+    ``expected_mac`` when given), polling with exponential backoff until
+    ``deadline`` seconds have passed.
+    """
+    return bounce_adapters({adapter_name: expected_mac}, backend, deadline)[adapter_name]
+
+def resolve_adapter(adapter: str, backend: Optional[SystemBackend] = None) -> Optional[Adapter]:
+    """Adapter record (with registry subkey) by connection name, GUID, MAC or description"""
+    backend = backend or get_backend()
+    found = get_adapter_inventory(backend).find(adapter)
+    if found is None or found.subkey is None:
+        # The cached inventory may predate a new or renamed adapter
+        found = get_adapter_inventory(backend, fresh=True).find(adapter)
+    return found if found is not None and found.subkey is not None else None
+
+@traced()
+def set_mac_address(adapter_name: str, new_mac: str, backend: Optional[SystemBackend] = None,
+                    deadline: float = BOUNCE_DEADLINE) -> tuple[bool, str]:
+    """Set MAC address for a network adapter"""
+    backend = backend or get_backend()
+    try:
+        # Clean MAC address format
+        new_mac_clean = normalize_mac(new_mac)
+
+        # Find adapter in registry (only this key is opened for write)
+        adapter = resolve_adapter(adapter_name, backend)
+        if adapter is None:
+            return False, "Adapter not found in registry"
+
+        backend.reg_set(adapter.subkey, "NetworkAddress", new_mac_clean)
+
+        # Disable and re-enable adapter (netsh needs the connection name)
+        bounce = bounce_adapter(adapter.name, new_mac_clean, backend, deadline)
+        backend.probe_cache.invalidate("adapters")
+
+        if bounce.error:
+            return False, f"MAC address written, but {adapter.name} was not restarted: {bounce.error}"
+        if not bounce.ok:
+            return False, (f"MAC address written, but {adapter.name} did not come back with it "
+                           f"within {deadline:g} s (current: {bounce.mac or 'N/A'})")
+        return True, f"MAC address changed to {bounce.mac}. Adapter back up in {bounce.latency:.2f} s."
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+@traced()
+def reset_mac_address(adapter_name: str, backend: Optional[SystemBackend] = None,
+                      deadline: float = BOUNCE_DEADLINE) -> tuple[bool, str]:
+    """Reset MAC address to original"""
+    backend = backend or get_backend()
+    try:
+        adapter = resolve_adapter(adapter_name, backend)
+        if adapter is None:
+            return False, "Adapter not found"
+
+        try:
+            backend.reg_delete(adapter.subkey, "NetworkAddress")
+        except FileNotFoundError:
+            pass
+
+        bounce = bounce_adapter(adapter.name, None, backend, deadline)
+        backend.probe_cache.invalidate("adapters")
+
+        if bounce.error:
+            return False, f"MAC address reset, but {adapter.name} was not restarted: {bounce.error}"
+        if not bounce.ok:
+            return False, f"MAC address reset, but {adapter.name} did not come back within {deadline:g} s"
+        return True, f"MAC address reset to {bounce.mac}. Adapter back up in {bounce.latency:.2f} s."
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+@traced()
+def apply_mac_batch(changes: dict, backend: Optional[SystemBackend] = None,
+                    deadline: float = BOUNCE_DEADLINE) -> dict:
+    """Set (or reset, for a None MAC) the MAC address of many adapters at once
+
+    ``changes`` maps adapter (connection name, GUID, MAC or description) to
+    the new MAC. Registry writes happen in one pass, then all adapters are
+    bounced concurrently, so wall time is close to a single bounce.
+    Returns adapter -> (success, message).
+    """
+    backend = backend or get_backend()
+    results = {}
+    pending = {}
+    try:
+        inventory = get_adapter_inventory(backend)
+        if any(inventory.find(key) is None or inventory.find(key).subkey is None for key in changes):
+            inventory = get_adapter_inventory(backend, fresh=True)
+
+        # One pass of registry writes
+        for key, new_mac in changes.items():
+            if new_mac and not MAC_PATTERN.match(new_mac.strip()):
+                results[key] = (False, f"Invalid MAC format '{new_mac}'. Use XX-XX-XX-XX-XX-XX")
+                continue
+            adapter = inventory.find(key)
+            if adapter is None or adapter.subkey is None:
+                results[key] = (False, "Adapter not found in registry")
+                continue
+            if adapter.name in pending.values():
+                results[key] = (False, f"Duplicate entry for adapter {adapter.name}")
+                continue
+            try:
+                if new_mac:
+                    backend.reg_set(adapter.subkey, "NetworkAddress", normalize_mac(new_mac))
+                else:
+                    try:
+                        backend.reg_delete(adapter.subkey, "NetworkAddress")
+                    except FileNotFoundError:
+                        pass
+            except Exception as e:
+                results[key] = (False, f"Error: {str(e)}")
+                continue
+            pending[key] = adapter.name
+
+        if pending:
+            bounces = bounce_adapters(
+                {name: changes[key] for key, name in pending.items()}, backend, deadline
+            )
+            backend.probe_cache.invalidate("adapters")
+            for key, name in pending.items():
+                bounce = bounces[name]
+                if bounce.ok:
+                    results[key] = (True, f"{name}: MAC is now {bounce.mac} (back up in {bounce.latency:.2f} s)")
+                elif bounce.error:
+                    results[key] = (False, f"{name}: {bounce.error}")
+                else:
+                    results[key] = (False, f"{name}: did not come back within {deadline:g} s (current: {bounce.mac or 'N/A'})")
+    except Exception as e:
+        for key in changes:
+            results.setdefault(key, (False, f"Error: {str(e)}"))
+    return results
+
+def load_config() -> dict:
+    """Load saved configuration"""
+    try:
+        if os.path.exists(CONFIG_FILE):
+            with open(CONFIG_FILE, 'r') as f:
+                return json.load(f)
+    except:
+        pass
+    return {"original_datetime": None, "locked": True}
+
+def save_config(config: dict):
+    """Save configuration"""
+    try:
+        with open(CONFIG_FILE, 'w') as f:
+            json.dump(config, f, indent=2)
+    except:
+        pass
@@ -0,0 +1,191 @@
+"""
+Timelines - scripted sequences of clock changes executed at precise real-time
+instants
+
+A scenario is a list of steps, each scheduled ``at`` seconds after the start
+or ``after`` seconds after the previous step:
+
+    [
+        {"at": 0, "set": "2027-02-28T23:59:50"},
+        {"after": 30, "set": "2027-03-01T00:00:05"},
+        {"after": 10, "offset": "+1d"},
+        {"after": 5, "timezone": "Tokyo Standard Time"},
+        {"after": 5, "restore": true}
+    ]
+
+Steps are scheduled on ``time.monotonic`` so the clock changes themselves
+cannot disturb the schedule. Each step type keeps a running estimate of its
+apply latency: set/offset targets are pre-advanced by it, and timezone /
+restore steps are launched that much early. Jitter is how far the moment the
+change took effect landed from its scheduled instant.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple, Optional
+
+from .backend import SystemBackend, get_backend
+from .stats import percentile
+from .fakeclock import parse_offset
+from .system import disable_time_sync, set_system_datetime, set_timezone, restore_time_sync
+
+STEP_KINDS = ("set", "offset", "timezone", "restore")
+
+# Weight of the newest sample in each latency estimate
+LATENCY_SMOOTHING = 0.3
+
+# Sleep until this close to a launch instant, then spin
+SPIN_WINDOW = 0.002
+
+class Step(NamedTuple):
+    at: float
+    kind: str
+    value: object
+
+class StepResult(NamedTuple):
+    index: int
+    kind: str
+    value: str
+    scheduled: float
+    launched: float
+    latency: float
+    estimate: float
+    jitter: float
+    ok: bool
+    message: str
+
+def parse_steps(items) -> list:
+    """Steps from scenario dicts (or a ``{"steps": [...]}`` document), sorted by time"""
+    if isinstance(items, dict):
+        items = items.get("steps", [])
+    steps = []
+    previous = 0.0
+    for position, item in enumerate(items, 1):
+        kinds = [kind for kind in STEP_KINDS if kind in item]
+        if len(kinds) != 1:
+            raise ValueError(f"Step {position}: expected exactly one of {', '.join(STEP_KINDS)}")
+        kind = kinds[0]
+        if "at" in item:
+            at = float(item["at"])
+        else:
+            at = previous + float(item.get("after", 0))
+        if at < 0:
+            raise ValueError(f"Step {position}: negative start time")
+
+        value = item[kind]
+        if kind == "set":
+            value = datetime.fromisoformat(str(value))
+        elif kind == "offset":
+            value = parse_offset(str(value))
+        elif kind == "timezone":
+            value = str(value)
+        else:
+            value = None
+        steps.append(Step(at, kind, value))
+        previous = at
+    return sorted(steps, key=lambda step: step.at)
+
+def load_scenario(path: str) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_steps(json.load(f))
+
+class Timeline:
+    """Runs a list of steps against a backend on a monotonic schedule"""
+
+    def __init__(self, steps: list, backend: Optional[SystemBackend] = None,
+                 clock: Callable = time.monotonic, latency_hints: Optional[dict] = None):
+        self.steps = list(steps)
+        self.backend = backend or get_backend()
+        self.clock = clock
+        self.estimates = {kind: 0.0 for kind in STEP_KINDS}
+        self.estimates.update(latency_hints or {})
+        self.results = []
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop before the next step"""
+        self._cancelled.set()
+
+    def _wait_until(self, instant: float) -> bool:
+        """Sleep (then spin) until ``instant`` on the monotonic clock; False if cancelled"""
+        while True:
+            remaining = instant - self.clock()
+            if remaining <= 0:
+                return not self._cancelled.is_set()
+            if remaining > SPIN_WINDOW:
+                if self._cancelled.wait(remaining - SPIN_WINDOW):
+                    return False
+
+    def _apply(self, step: Step, estimate: float) -> tuple[bool, str]:
+        if step.kind in ("set", "offset"):
+            base = step.value if step.kind == "set" else self.backend.now() + step.value
+            # The clock is written when the call completes, ~estimate seconds from now
+            target = base + timedelta(seconds=estimate)
+            return set_system_datetime(
+                target.year, target.month, target.day, target.hour, target.minute,
+                target.second + target.microsecond / 1e6, self.backend, disable_sync=False
+            )
+        if step.kind == "timezone":
+            return set_timezone(step.value, self.backend)
+        return restore_time_sync(self.backend)
+
+    def run(self, on_step: Optional[Callable] = None) -> dict:
+        """Execute every step; ``on_step`` receives each StepResult as it completes"""
+        self.results = []
+        # Stopping time sync is one-off setup; keep it out of the schedule and the latency estimates
+        if any(step.kind in ("set", "offset") for step in self.steps):
+            disable_time_sync(self.backend)
+        origin = self.clock()
+        for index, step in enumerate(self.steps):
+            estimate = self.estimates[step.kind]
+            scheduled = origin + step.at
+            # Steps without a target value are launched early instead
+            launch = scheduled if step.kind in ("set", "offset") else scheduled - estimate
+            # A no-op unless a restore step turned time sync back on
+            ready, message = disable_time_sync(self.backend) if step.kind in ("set", "offset") else (True, "")
+            if not self._wait_until(launch):
+                break
+
+            launched = self.clock()
+            if ready:
+                try:
+                    ok, message = self._apply(step, estimate)
+                except Exception as e:
+                    ok, message = False, f"Error: {str(e)}"
+            else:
+                ok = False
+            latency = self.clock() - launched
+
+            # The change took effect at launch + latency; set/offset targets were pre-advanced by the estimate
+            pre_advance = estimate if step.kind in ("set", "offset") else 0.0
+            jitter = launched + latency - pre_advance - scheduled
+            if ready:
+                self.estimates[step.kind] = (
+                    latency if estimate == 0.0 else estimate + LATENCY_SMOOTHING * (latency - estimate)
+                )
+
+            value = step.value.isoformat() if isinstance(step.value, datetime) else (
+                str(step.value) if step.value is not None else "")
+            result = StepResult(index, step.kind, value, step.at, launched - origin,
+                                latency, estimate, jitter, ok, message)
+            self.results.append(result)
+            if on_step:
+                on_step(result)
+        return self.report()
+
+    def report(self) -> dict:
+        """Per-step results and jitter summary (milliseconds)"""
+        jitters = [abs(r.jitter) for r in self.results]
+        return {
+            "steps": len(self.steps),
+            "completed": len(self.results),
+            "failed": sum(1 for r in self.results if not r.ok),
+            "jitter_ms": {
+                "p50": percentile(jitters, 50) * 1000,
+                "p95": percentile(jitters, 95) * 1000,
+                "max": max(jitters, default=0.0) * 1000,
+            },
+            "results": [r._asdict() for r in self.results],
+        }
@@ -0,0 +1,124 @@
+"""
+Timezone catalog - parses ``tzutil /l`` into records and indexes them for
+type-to-filter search
+"""
+
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from typing import NamedTuple, Optional
+
+class TimezoneRecord(NamedTuple):
+    id: str
+    display: str
+    offset_minutes: int
+
+    @property
+    def offset_label(self) -> str:
+        sign = "+" if self.offset_minutes >= 0 else "-"
+        hours, minutes = divmod(abs(self.offset_minutes), 60)
+        return f"UTC{sign}{hours:02d}:{minutes:02d}"
+
+_OFFSET_PATTERN = re.compile(r"^\(UTC(?:([+-])(\d{1,2}):(\d{2}))?\)")
+
+def parse_offset(display: str) -> int:
+    """UTC offset in minutes from a display name like ``(UTC+03:30) Tehran``"""
+    match = _OFFSET_PATTERN.match(display)
+    if not match or not match.group(1):
+        return 0
+    minutes = int(match.group(2)) * 60 + int(match.group(3))
+    return -minutes if match.group(1) == "-" else minutes
+
+def parse_tzutil_list(text: str) -> list:
+    """Parse ``tzutil /l`` output (display line, id line, blank) into records"""
+    records = []
+    display = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("(UTC"):
+            display = line
+        elif display is not None:
+            records.append(TimezoneRecord(line, display, parse_offset(display)))
+            display = None
+    return records
+
+def save_catalog(path: str, key: str, records: list):
+    """Write the catalog to a compact JSON cache file tagged with ``key``"""
+    data = {"key": key, "saved": time.time(), "zones": [list(r) for r in records]}
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def load_catalog(path: str, key: str) -> Optional[tuple]:
+    """(records, saved_timestamp) from the cache file, or None if missing or keyed differently"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("key") != key:
+            return None
+        records = [TimezoneRecord(str(i), str(d), int(o)) for i, d, o in data["zones"]]
+        return (records, float(data["saved"])) if records else None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+class TimezoneIndex:
+    """Prefix and substring search over ids, display names and UTC offsets"""
+
+    def __init__(self, records: list):
+        self.records = sorted(records, key=lambda r: (r.offset_minutes, r.display))
+        self._by_id = {r.id.lower(): r for r in self.records}
+        self._haystacks = [f"{r.id} {r.display}".lower() for r in self.records]
+
+        # Sorted (token, position) pairs for bisect prefix lookups
+        tokens = set()
+        for position, record in enumerate(self.records):
+            words = re.split(r"[\s,()/.]+", f"{record.id} {record.display}".lower())
+            for token in [record.id.lower(), record.display.lower(), record.offset_label.lower()] + words:
+                if token:
+                    tokens.add((token, position))
+        self._tokens = sorted(tokens)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, tz_id: str) -> Optional[TimezoneRecord]:
+        """Exact (case-insensitive) lookup by timezone id"""
+        return self._by_id.get(tz_id.strip().lower())
+
+    def search(self, query: str, limit: Optional[int] = None) -> list:
+        """Records matching ``query``: word-prefix matches first, then substring matches"""
+        query = query.strip().lower()
+        if not query:
+            return self.records[:limit]
+
+        positions = []
+        seen = set()
+        start = bisect_left(self._tokens, (query, -1))
+        for token, position in self._tokens[start:]:
+            if not token.startswith(query):
+                break
+            if position not in seen:
+                seen.add(position)
+                positions.append(position)
+        positions.sort()
+
+        substring = [
+            position for position, haystack in enumerate(self._haystacks)
+            if position not in seen and query in haystack
+        ]
+        results = [self.records[p] for p in positions + substring]
+        return results[:limit]
+
+    def resolve(self, text: str) -> Optional[TimezoneRecord]:
+        """Record for an exact id, or the only search hit for ``text``"""
+        record = self.get(text)
+        if record is not None:
+            return record
+        matches = self.search(text, limit=2)
+        return matches[0] if len(matches) == 1 else None
@@ -0,0 +1,297 @@
+"""
+Tracing - spans around process spawns, registry calls, operations and UI
+handlers, aggregated into per-operation latency histograms
+
+Off by default; while disabled every hook is a flag check and a shared no-op
+object. Enable with ``tracing.enable()``, ``--trace PREFIX`` on the command
+line or ``CLOCKER_TRACE=PREFIX``; the last two write ``PREFIX.json`` and
+``PREFIX.prom`` (Prometheus text format) when the process exits.
+
+    with span("netsh", "run", "netsh interface set ...") as s:
+        result = ...
+        s.set_exit_code(result.returncode)
+
+    @traced(kind="ui")
+    def apply_datetime(self): ...
+"""
+
+import atexit
+import collections
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+from .stats import percentile
+
+ENV_VAR = "CLOCKER_TRACE"
+
+# Finished spans kept for the JSON export
+SPAN_HISTORY = 10000
+
+# Durations kept per operation for the percentiles
+HISTOGRAM_SAMPLES = 4096
+
+# Histogram bucket upper bounds (seconds)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Span(NamedTuple):
+    id: int
+    parent_id: Optional[int]
+    parent: str
+    name: str
+    kind: str
+    detail: str
+    start: float
+    duration: float
+    exit_code: Optional[int]
+    error: str
+    thread: str
+
+class Histogram:
+    """Bucket counts plus a window of recent durations for one (kind, name)"""
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.samples = collections.deque(maxlen=HISTOGRAM_SAMPLES)
+
+    def add(self, duration: float, failed: bool):
+        for index, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                self.buckets[index] += 1
+                break
+        self.count += 1
+        self.total += duration
+        self.errors += failed
+        self.samples.append(duration)
+
+_enabled = False
+_local = threading.local()
+_ids = itertools.count(1)
+_lock = threading.Lock()
+_spans = collections.deque(maxlen=SPAN_HISTORY)
+_histograms = {}
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+def reset():
+    """Drop every recorded span and histogram"""
+    with _lock:
+        _spans.clear()
+        _histograms.clear()
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def current() -> Optional["ActiveSpan"]:
+    """The innermost open span on this thread (or the one bound to it)"""
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+# ==================== SPANS ====================
+
+class ActiveSpan:
+    """An open span; closing it records a Span and feeds the histogram"""
+    __slots__ = ("id", "name", "kind", "detail", "exit_code", "parent", "_start", "_wall")
+
+    def __init__(self, name: str, kind: str, detail: str):
+        self.id = next(_ids)
+        self.name = name
+        self.kind = kind
+        self.detail = detail
+        self.exit_code = None
+        self.parent = None
+
+    def set_exit_code(self, code: Optional[int]):
+        self.exit_code = code
+
+    def __enter__(self) -> "ActiveSpan":
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        error = f"{exc_type.__name__}: {exc}" if exc_type is not None else ""
+        parent = self.parent
+        record = Span(
+            self.id, parent.id if parent else None, parent.name if parent else "",
+            self.name, self.kind, self.detail, self._wall, duration, self.exit_code, error,
+            threading.current_thread().name
+        )
+        failed = bool(error) or bool(self.exit_code)
+        with _lock:
+            _spans.append(record)
+            histogram = _histograms.get((self.kind, self.name))
+            if histogram is None:
+                histogram = _histograms[(self.kind, self.name)] = Histogram()
+            histogram.add(duration, failed)
+        return False
+
+class _NoopSpan:
+    """Stands in for ActiveSpan while tracing is off"""
+    __slots__ = ()
+
+    def set_exit_code(self, code):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _NoopSpan()
+
+def span(name: str, kind: str = "operation", detail: str = ""):
+    """Context manager timing one call; a shared no-op while tracing is off"""
+    if not _enabled:
+        return _NOOP
+    return ActiveSpan(name, kind, detail)
+
+def traced(name: Optional[str] = None, kind: str = "operation"):
+    """Decorator wrapping each call of a function in a span named after it"""
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with ActiveSpan(label, kind, ""):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def bind(fn: Callable) -> Callable:
+    """``fn`` with the current span as its parent, for handing to another thread"""
+    if not _enabled:
+        return fn
+    parent = current()
+    if parent is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        stack = _stack()
+        stack.append(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stack.remove(parent)
+    return run
+
+# ==================== EXPORT ====================
+
+def snapshot(spans: bool = True) -> dict:
+    """Per-operation latency percentiles (milliseconds) and, optionally, the recent spans"""
+    with _lock:
+        histograms = {key: (h.count, h.errors, h.total, list(h.samples)) for key, h in _histograms.items()}
+        recent = [s._asdict() for s in _spans] if spans else []
+    operations = {}
+    for (kind, name), (count, errors, total, samples) in sorted(histograms.items()):
+        operations[f"{kind}:{name}"] = {
+            "kind": kind,
+            "name": name,
+            "count": count,
+            "errors": errors,
+            "mean_ms": total / count * 1000 if count else 0.0,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+            "max_ms": max(samples, default=0.0) * 1000,
+        }
+    report = {"enabled": _enabled, "operations": operations}
+    if spans:
+        report["spans"] = recent
+    return report
+
+def _labels(kind: str, name: str, **extra) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    pairs = {"kind": kind, "name": name, **extra}
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in pairs.items()) + "}"
+
+def prometheus_text() -> str:
+    """The histograms in Prometheus text exposition format"""
+    with _lock:
+        histograms = {key: (list(h.buckets), h.count, h.total, h.errors, list(h.samples))
+                      for key, h in _histograms.items()}
+    lines = [
+        "# HELP clocker_span_duration_seconds Duration of traced calls",
+        "# TYPE clocker_span_duration_seconds histogram",
+    ]
+    for (kind, name), (buckets, count, total, _, _) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS, buckets):
+            cumulative += bucket
+            lines.append(f"clocker_span_duration_seconds_bucket{_labels(kind, name, le=f'{bound:g}')} {cumulative}")
+        lines.append(f"clocker_span_duration_seconds_bucket{_labels(kind, name, le='+Inf')} {count}")
+        lines.append(f"clocker_span_duration_seconds_sum{_labels(kind, name)} {total:.6f}")
+        lines.append(f"clocker_span_duration_seconds_count{_labels(kind, name)} {count}")
+
+    lines += [
+        "# HELP clocker_span_latency_seconds Latency percentiles over recent calls",
+        "# TYPE clocker_span_latency_seconds gauge",
+    ]
+    for (kind, name), (_, _, _, _, samples) in sorted(histograms.items()):
+        for quantile in (50, 95, 99):
+            value = percentile(samples, quantile)
+            lines.append(f"clocker_span_latency_seconds{_labels(kind, name, quantile=quantile / 100)} {value:.6f}")
+
+    lines += [
+        "# HELP clocker_span_errors_total Traced calls that raised or exited non-zero",
+        "# TYPE clocker_span_errors_total counter",
+    ]
+    for (kind, name), (_, _, _, errors, _) in sorted(histograms.items()):
+        lines.append(f"clocker_span_errors_total{_labels(kind, name)} {errors}")
+    return "\n".join(lines) + "\n"
+
+def export_json(path: str, spans: bool = True):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot(spans), f, indent=2)
+
+def export_prometheus(path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+
+def export(prefix: str):
+    """Write ``<prefix>.json`` and ``<prefix>.prom``"""
+    export_json(f"{prefix}.json")
+    export_prometheus(f"{prefix}.prom")
+
+def trace_to(prefix: str):
+    """Enable tracing now and export to ``prefix`` when the process exits"""
+    enable()
+    atexit.register(export, prefix)
+
+def install_from_env(environ=None) -> Optional[str]:
+    """Start tracing if CLOCKER_TRACE names an export prefix"""
+    prefix = (environ if environ is not None else os.environ).get(ENV_VAR, "").strip()
+    if prefix:
+        trace_to(prefix)
+    return prefix or None